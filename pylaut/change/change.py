@@ -1,11 +1,21 @@
-from copy import deepcopy
+import copy
 
 from pylaut import utils
+from pylaut.change import fst
 from pylaut.language.phonology.phone import Phone
-from pylaut.language.phonology.word import Syllable, Word
+from pylaut.language.phonology.word import (SYLLABLE_BOUNDARY,
+                                            WORD_BOUNDARY, Syllable, Word,
+                                            rebuild_syllable)
 from pylaut.utils import flatten_partial
 
 
+class Tone(object):
+    """
+    Stands for the tone tier of a word in This.forall: a change over Tone
+    visits the tones of every syllable, and none of its segments.
+    """
+
+
 class This(object):
     """
     A dummy object for "the current position" in a word. Contains utility
@@ -24,28 +34,16 @@ class This(object):
         if kind == Syllable:
 
             def run_at_syllable(ch, p=pred):
-                idx = ch.syllables.index(ch.syllable)
-                if idx + position < 0:
-                    return False
-                try:
-                    return p(ch.syllables[ch.syllables.index(ch.syllable) +
-                                          position])
-                except IndexError:
-                    return False
+                syllable = ch.syllable_at(position)
+                return False if syllable is None else p(syllable)
 
             return run_at_syllable
 
         elif kind == Phone:
 
             def run_at_phoneme(ch, p=pred):
-                idx = ch.phonemes.index(ch.phoneme)
-                if idx + position < 0:
-                    return False
-                try:
-                    return p(
-                        ch.phonemes[ch.phonemes.index(ch.phoneme) + position])
-                except IndexError:
-                    return False
+                phoneme = ch.segment_at(position)
+                return phoneme is not WORD_BOUNDARY and p(phoneme)
 
             return run_at_phoneme
 
@@ -67,6 +65,9 @@ class This(object):
             return lambda pred: lambda ch: lambda f, c: ch._run_syl(pred, f, c)
         elif kind == Phone:
             return lambda pred: lambda ch: lambda f, c: ch._run_ph(pred, f, c)
+        elif kind == Tone:
+            return lambda pred: lambda ch: lambda f, c: ch._run_tone(
+                pred, f, c)
         else:
             raise ValueError("Unknown position type")
 
@@ -86,10 +87,12 @@ class This(object):
         """
 
         def is_at_syllable(td, index=index):
-            return td.syllable == td.syllables[index]
+            n = len(td.syllables)
+            return -n <= index < n and td.syl_index == index % n
 
         def is_at_phoneme(td, index=index):
-            return td.phoneme == td.phonemes[index]
+            n = len(td.phonemes)
+            return -n <= index < n and td.ph_index == index % n
 
         if kind == Syllable:
             return is_at_syllable
@@ -104,14 +107,23 @@ class Change(object):
     """
     Core data structure to represent a sound change.
     Each method takes a change and returns a new one, thus enabling persistence
-    and method chaining.
+    and method chaining. Changes are never modified once built, so the new
+    change shares everything but the extended part with the old one.
+
+    A change may also carry a compiled form (see the fst module), which is
+    then used by apply instead of a Transducer. Conditions added with when
+    or unless are compiled along if they can be; any other extension drops
+    the compiled form.
     """
 
     def __init__(self):
         self.appl = None
         self.changes = None
         self.label = None
-        self.conditions = []
+        self.conditions = ()
+        self.compiled = None
+        # False if the change depends on more than the word, see lib.impure
+        self.pure = True
 
     def __call__(self, w):
         return self.apply(w)
@@ -144,9 +156,13 @@ class Change(object):
             ch.when(This.at(Phone, 0, λ p: p.is_vowel()))
             ch.when(λ td: td.phoneme.is_vowel())
         """
-        nc = deepcopy(self)
-        nc.conditions.append(what)
-        return nc
+        compiled = self.compiled
+        if compiled is not None:
+            environment = fst.environment_of(what)
+            compiled = (compiled.when(environment)
+                        if environment is not None else None)
+        return self._with(conditions=self.conditions + (what, ),
+                          compiled=compiled)
 
     def unless(self, what):
         """
@@ -154,9 +170,14 @@ class Change(object):
 
         when, but with the condition negated
         """
-        nc = deepcopy(self)
-        nc.conditions.append(lambda x: not what(x))
-        return nc
+        compiled = self.compiled
+        if compiled is not None:
+            environment = fst.environment_of(what)
+            compiled = (compiled.when(fst.Not(environment))
+                        if environment is not None else None)
+        return self._with(
+            conditions=self.conditions + (lambda x: not what(x), ),
+            compiled=compiled)
 
     def to(self, fetcher):
         """
@@ -188,9 +209,9 @@ class Change(object):
                 λ p: p.feature_is_false("continuant"), f, c))
 
         """
-        nc = deepcopy(self)
-        nc.appl = fetcher if nc.appl is None else utils.o(fetcher, nc.appl)
-        return nc
+        return self._with(appl=fetcher if self.appl is None else
+                          utils.o(fetcher, self.appl),
+                          compiled=None)
 
     def do(self, changer):
         """
@@ -205,9 +226,34 @@ class Change(object):
         This would set the change to shift stress to a certain syllable when
             its conditions are met.
         """
-        nc = deepcopy(self)
-        nc.changes = changer if nc.changes is None else utils.o(
-            changer, nc.changes)
+        return self._with(changes=changer if self.changes is None else
+                          utils.o(changer, self.changes),
+                          compiled=None)
+
+    def impure(self):
+        """
+        impure :: Change -> Change
+
+        Returns a new Change that is marked as depending on more than the
+        word it is applied to, so that its results are never memoized.
+        """
+        return self._with(pure=False)
+
+    def with_rule(self, rule):
+        """
+        with_rule :: (Change * SegmentRule) -> Change
+
+        Returns a new Change that is applied by the compiled rule `rule`,
+        which must have the same effect as the change itself.
+        """
+        return self._with(compiled=rule)
+
+    def _with(self, **attrs):
+        """
+        Returns a shallow copy of self with the given attributes replaced.
+        """
+        nc = copy.copy(self)
+        nc.__dict__.update(attrs)
         return nc
 
     def _eval(self, transducer):
@@ -225,14 +271,89 @@ class Change(object):
 
         Call this method to apply a sound change to a word.
         """
+        if self.compiled is not None:
+            return self.compiled.apply(word_obj)
         # TODO: stop this calling back-and-forth fuckness
         return Transducer(word_obj, self)()
 
 
+# Tiers that PyLautLang conditions can refer to by name, as in Vowel[@-1].
+# More can be added with register_tier. Tiers are projected from the segments
+# of a word (see Transducer.segments), so the Tone tier holds the tones of
+# its syllables.
+TIERS = {
+    "Vowel": lambda p: p.is_vowel(),
+    "Consonant": lambda p: p.is_consonant(),
+    "Tone": lambda p: p.is_tone(),
+}
+
+
+def register_tier(name, pred):
+    """
+    register_tier :: (String * (Phoneme -> Bool)) -> None
+
+    Makes the tier of phonemes satisfying pred available to PyLautLang
+    conditions under name.
+    """
+    TIERS[name] = pred
+
+
+class Tier(object):
+    """
+    The projection of a sequence of segments onto those satisfying a
+    predicate, e.g. the vowels of a word. positions holds the indices of the
+    segments on the tier, and rank[i] the number of them before index i, so
+    that the tier neighbours of any segment are found without a scan.
+    """
+
+    def __init__(self, phonemes, pred):
+        self.positions = []
+        self.rank = []
+        for i, p in enumerate(phonemes):
+            self.rank.append(len(self.positions))
+            if pred(p):
+                self.positions.append(i)
+        self.rank.append(len(self.positions))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def contains(self, index):
+        return self.rank[index + 1] > self.rank[index]
+
+    def neighbour(self, index, offset):
+        """
+        Returns the index of the phoneme `offset` steps along the tier from
+        the phoneme at index: -1 is the nearest tier phoneme before it, 1
+        the nearest one after it, and 0 the phoneme itself if it is on the
+        tier. Returns None if there is no such phoneme.
+        """
+        if offset == 0:
+            return index if self.contains(index) else None
+        if offset < 0:
+            k = self.rank[index] + offset
+        else:
+            k = self.rank[index + 1] + offset - 1
+        if 0 <= k < len(self.positions):
+            return self.positions[k]
+        return None
+
+
 class Transducer(object):
     """
     Class for applying sound changes to words. Supports iteration through
     both syllables and phonemes.
+
+    The current position is tracked by cursors: ph_index is the index of the
+    current phoneme in the word, syl_index that of the current syllable, and
+    syl_ph_index that of the current phoneme within its syllable. While
+    iterating over syllables, the phoneme cursors point at the first phoneme
+    of the current syllable.
+
+    The input word is never modified. Changes that do more than replace the
+    current phoneme record edits against the cursor instead (see insert,
+    delete and swap), and the new word is built from the edits in the same
+    pass. Conditions therefore always see the input word.
     """
 
     def __init__(self, word, change):
@@ -242,13 +363,132 @@ class Transducer(object):
         self.phonemes = self.word.phonemes
         self.phoneme = self.phonemes[0]
 
+        self.ph_index = 0
+        self.syl_index = 0
+        self.syl_ph_index = 0
+
         self.change = change
 
         self.ignore_next = False
 
+        # edits recorded against phoneme indices of the input word:
+        # phonemes to put after a phoneme, phonemes to drop, and phonemes
+        # to put in place of a phoneme without evaluating the change there
+        self._inserted = dict()
+        self._deleted = set()
+        self._replaced = dict()
+
+        self._syllable_tests = dict()
+        self._tiers = dict()
+        self._segments = None
+        self._segment_index = None
+
     def __call__(self):
         return self.change._eval(self)
 
+    def phoneme_at(self, offset):
+        """
+        Returns the phoneme at `offset` from the current one, or None if that
+        is outside the word.
+        """
+        idx = self.ph_index + offset
+        if 0 <= idx < len(self.phonemes):
+            return self.phonemes[idx]
+        return None
+
+    def segment_at(self, offset, syllable=False):
+        """
+        Returns the phoneme at `offset` from the current one, or
+        WORD_BOUNDARY if that is outside the word. If `syllable` is true,
+        positions inside the word but outside the current syllable give
+        SYLLABLE_BOUNDARY.
+        """
+        idx = self.ph_index + offset
+        if idx < 0 or idx >= len(self.phonemes):
+            return WORD_BOUNDARY
+        if syllable:
+            syl_idx = self.syl_ph_index + offset
+            if syl_idx < 0 or syl_idx >= len(self.syllable.phonemes):
+                return SYLLABLE_BOUNDARY
+        return self.phonemes[idx]
+
+    def window(self, before, after, syllable=False):
+        """
+        Returns the segments from `before` positions before the current
+        phoneme to `after` positions after it, as given by segment_at.
+        """
+        return tuple(
+            self.segment_at(offset, syllable)
+            for offset in range(-before, after + 1))
+
+    @property
+    def segments(self):
+        """
+        The phonemes of the word with the tones of every syllable after its
+        phonemes, as they are written, e.g. m a ˥ t a ˩. Tiers are
+        projected from these.
+        """
+        if self._segments is None:
+            segments = []
+            index = []
+            for syl in self.syllables:
+                for p in syl.phonemes:
+                    index.append(len(segments))
+                    segments.append(p)
+                segments.extend(syl.tones)
+            self._segments = segments
+            self._segment_index = index
+        return self._segments
+
+    def tier(self, pred):
+        """
+        Returns the Tier of the segments of the word satisfying pred. Each
+        tier is projected once per word.
+        """
+        try:
+            return self._tiers[pred]
+        except KeyError:
+            tier = Tier(self.segments, pred)
+            self._tiers[pred] = tier
+            return tier
+
+    def tier_at(self, pred, offset):
+        """
+        Returns the segment `offset` steps from the current phoneme along
+        the tier of pred (see Tier.neighbour), or WORD_BOUNDARY if there is
+        none. This is how long-distance conditions such as vowel harmony
+        find the nearest vowel, or tone rules the nearest tone.
+        """
+        tier = self.tier(pred)
+        idx = tier.neighbour(self._segment_index[self.ph_index], offset)
+        if idx is None:
+            return WORD_BOUNDARY
+        return self._segments[idx]
+
+    def syllables_where(self, pred):
+        """
+        Returns a tuple with the truth value of pred for every syllable of
+        the word. Each predicate is tested on the syllables once per word,
+        so conditions that look at other syllables from every position do
+        not test a syllable again each time.
+        """
+        try:
+            return self._syllable_tests[pred]
+        except KeyError:
+            result = tuple(bool(pred(s)) for s in self.syllables)
+            self._syllable_tests[pred] = result
+            return result
+
+    def syllable_at(self, offset):
+        """
+        Returns the syllable at `offset` from the current one, or None if that
+        is outside the word.
+        """
+        idx = self.syl_index + offset
+        if 0 <= idx < len(self.syllables):
+            return self.syllables[idx]
+        return None
+
     # this is quite unpretty but
 
     def _run_ph(self, pred, f, cond):
@@ -275,27 +515,30 @@ class Transducer(object):
             A new Word object derived from self.word by applying self.change.
         """
         new_syllables = []
-        for syllable in self.word:
+        self.ph_index = -1
+        for syl_index, syllable in enumerate(self.word):
             self.syllable = syllable
+            self.syl_index = syl_index
             new_syllable = []
-            for phoneme in syllable:
+            for syl_ph_index, phoneme in enumerate(syllable):
                 self.phoneme = phoneme
-                if self.ignore_next:
+                self.ph_index += 1
+                self.syl_ph_index = syl_ph_index
+                if self.ph_index in self._replaced:
+                    np = self._replaced.pop(self.ph_index)
+                elif self.ignore_next:
                     np = phoneme
                     self.ignore_next = False
                 else:
-                    try:
-                        np = (f(self)
-                              if pred(phoneme) and cond(self) else phoneme)
-                    except IndexError:
-                        np = phoneme
+                    np = (f(self)
+                          if pred(phoneme) and cond(self) else phoneme)
+                if self.ph_index in self._deleted:
+                    np = None
                 new_syllable.append(np)
+                new_syllable.extend(self._inserted.pop(self.ph_index, ()))
             clean_syllable = flatten_partial(
                 filter(lambda x: x is not None, new_syllable))
-            ns = Syllable(clean_syllable)
-            if syllable.is_stressed():
-                ns.set_stressed()
-            new_syllables.append(ns)
+            new_syllables.append(rebuild_syllable(syllable, clean_syllable))
         return Word(new_syllables)
 
     def _run_syl(self, pred, f, cond):
@@ -321,42 +564,152 @@ class Transducer(object):
             A new Word object derived from self.word by applying self.change.
         """
         new_syllables = []
-        for syllable in self.word:
+        self.ph_index = 0
+        self.syl_ph_index = 0
+        in_domain = self.syllables_where(pred)
+        for syl_index, syllable in enumerate(self.word):
             self.syllable = syllable
+            self.syl_index = syl_index
+            if syllable.phonemes:
+                self.phoneme = syllable.phonemes[0]
             if not self.ignore_next:
-                try:
-                    new_syllable = (f(self) if pred(syllable) and cond(self)
-                                    else syllable)
-                except IndexError:
-                    new_syllable = syllable
+                new_syllable = (f(self) if in_domain[syl_index] and cond(self)
+                                else syllable)
             self.ignore_next = False
-            ns = Syllable(new_syllable)
-            if syllable.is_stressed():
-                ns.set_stressed()
-            new_syllables.append(ns)
+            self.ph_index += len(syllable)
+            new_syllables.append(rebuild_syllable(syllable, new_syllable))
         return Word(new_syllables)
 
+    def _run_tone(self, pred, f, cond):
+        """
+        _run_tone :: (Transducer * (Phoneme -> Bool) *
+                      (Transducer -> Plist[Phoneme]) * (Transducer -> Bool)
+                     ) -> Word
+
+        Applies a sound change over the tone tier of the current word. The
+        segments are not visited. While a tone is visited, it is the
+        current tone, and the other cursors point at the syllable it is
+        anchored to, as in _run_syl.
+
+        Args:
+            pred: A predicate on the current tone. Corresponds to the
+                domain of the sound change.
+
+            f: A function that transforms one tone into zero or more
+                tones. The actual change.
+
+            cond: A predicate on the current state on the transducer.
+
+        Returns:
+            A new Word object derived from self.word by applying self.change,
+            or self.word itself if no tone changed.
+        """
+        if not any(syllable.tones for syllable in self.word.syllables):
+            return self.word
+        new_tones = []
+        changed = False
+        self.ph_index = 0
+        self.syl_ph_index = 0
+        for syl_index, syllable in enumerate(self.word):
+            self.syllable = syllable
+            self.syl_index = syl_index
+            if syllable.phonemes:
+                self.phoneme = syllable.phonemes[0]
+            syl_tones = []
+            for tone in syllable.tones:
+                self.tone = tone
+                if pred(tone) and cond(self):
+                    syl_tones.append(f(self))
+                    changed = True
+                else:
+                    syl_tones.append(tone)
+            new_tones.append(flatten_partial(
+                filter(lambda x: x is not None, syl_tones)))
+            self.ph_index += len(syllable)
+        return self.word.with_tones(new_tones) if changed else self.word
+
     def advance(self):
         """
         Causes the Transducer to skip the next phoneme.
         """
         self.ignore_next = True
 
+    def insert(self, phonemes):
+        """
+        Inserts phonemes after the current phoneme, in the same syllable. The
+        inserted phonemes are not visited by the change.
+        """
+        if not isinstance(phonemes, (list, tuple)):
+            phonemes = [phonemes]
+        self._inserted.setdefault(self.ph_index, []).extend(phonemes)
+
+    def delete(self):
+        """
+        Deletes the current phoneme, whatever the change returns for it.
+        """
+        self._deleted.add(self.ph_index)
+
+    def swap(self):
+        """
+        Exchanges the current phoneme with the next one, which may be in the
+        next syllable. Returns the next phoneme, which the change should
+        return for the current position; the current phoneme takes the
+        place of the next one, where the change is not evaluated. Returns
+        None if the current phoneme is the last one.
+        """
+        following = self.phoneme_at(1)
+        if following is None:
+            return None
+        self._replaced[self.ph_index + 1] = self.phoneme
+        return following
+
 
 class ChangeGroup(Change):
     """
     A class for grouping together several Changes that still need
-    to be applied all at once.
+    to be applied all at once. Conditions on the group are merged into its
+    changes once, when the group is built. If all of its changes are
+    compiled, the group is applied in one pass by a FusedRule; this is how
+    the branches of a PyLautLang conditional chain are evaluated.
     """
     def __init__(self, changes):
         super().__init__()
-        self.changes = changes
+        self.changes = tuple(changes)
+        self._merged = self.changes
+        self.pure = all(getattr(ch, "pure", True) for ch in self.changes)
+        self.compiled = self._compile()
+
+    def _with(self, **attrs):
+        nc = super()._with(**attrs)
+        merged = []
+        for ch in nc.changes:
+            for condition in nc.conditions:
+                ch = ch.when(condition)
+            merged.append(ch)
+        nc._merged = tuple(merged)
+        nc.compiled = nc._compile()
+        return nc
+
+    def _compile(self):
+        """
+        If every change of the group is compiled, returns a FusedRule that
+        applies them all in one pass, otherwise None.
+        """
+        rules = []
+        for ch in self._merged:
+            rule = getattr(ch, "compiled", None)
+            if isinstance(rule, fst.SegmentRule):
+                rules.append(rule)
+            elif isinstance(rule, fst.FusedRule):
+                rules.extend(rule.rules)
+            else:
+                return None
+        return fst.FusedRule(rules) if rules else None
 
     def apply(self, word_obj):
-        new_changes = [deepcopy(ch) for ch in self.changes]
-        for ch in new_changes:
-            ch.conditions.extend(self.conditions)
+        if self.compiled is not None:
+            return self.compiled.apply(word_obj)
         new_word = word_obj
-        for ch in new_changes:
+        for ch in self._merged:
             new_word = ch.apply(new_word)
         return new_word
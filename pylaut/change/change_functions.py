@@ -2,10 +2,12 @@ import copy
 from itertools import zip_longest
 from typing import Iterable, List, Optional
 
-from pylaut.change.change import Change, This, Transducer
+from pylaut.change import fst
+from pylaut.change.change import Change, This, Tone, Transducer
 from pylaut.language.phonology.phone import Phone
-from pylaut.language.phonology.phonology import Phoneme, Phonology
-from pylaut.language.phonology.word import Syllable, Word, WordFactory
+from pylaut.language.phonology.phonology import Phoneme
+from pylaut.language.phonology.syllabifier import Syllabifier
+from pylaut.language.phonology.word import Syllable, Word, rebuild_syllable
 
 
 class Contour(Phoneme):
@@ -22,58 +24,85 @@ class ComplexDomain(Change):
     def __init__(self, plist):
         super().__init__()
         self.contour = plist
+        self.matcher = fst.SequenceMatcher([[p.symbol for p in plist]])
 
     def apply(self, word_obj):
-        return super().apply(sequence_to_contour(word_obj, self.contour))
+        if len(self.contour) == 1 or self.compiled is not None:
+            return super().apply(word_obj)
+        return super().apply(
+            sequence_to_contour(word_obj, self.contour, self.matcher))
 
 
 class Resyllabify(Change):
-    def __init__(self, wf=None):
+    """
+    A change that divides a word into syllables anew, e.g. after segments
+    have been inserted, deleted or moved. The syllabifier is shared by every
+    word the change is applied to, so its lookup tables are only built once.
+    """
+    def __init__(self, wf=None, syllabifier=None):
         super().__init__()
         self.wf = wf
+        self.syllabifier = syllabifier
 
     def apply(self, word_obj):
-        segs = [p.symbol for p in word_obj.phonemes]
-        if not self.wf:
-            self.wf = WordFactory(Phonology(segs))
-        return self.wf.fromlist(segs)
-
-
-def match_subsequence(w: Word, ph: Phoneme,
-                      seq: List[Phoneme]) -> Optional[List[Phoneme]]:
-    symbols = list(map(lambda p: p.symbol, seq))
-    idx = w.phonemes.index(ph)
-    match = False
-    if ph.symbol in symbols:
-        try:
-            subsymbols = symbols[symbols.index(ph.symbol):]
-            subsequence = w.phonemes[idx:idx + len(subsymbols)]
-            match = all(
-                p.is_symbol(q.symbol) for (p, q) in zip(seq, subsequence))
-        except IndexError:
-            pass
-    return subsequence if match else None
+        if not self.syllabifier:
+            if self.wf:
+                self.syllabifier = self.wf.syllabifier
+            else:
+                self.syllabifier = Syllabifier()
+        return self.syllabifier.resyllabify(word_obj)
 
 
-def delete_phonemes_from_word(w: Word, seq: List[Phoneme]):
+def delete_phonemes_from_word(w: Word, seq: List[Phoneme]) -> Word:
+    """
+    Returns a new Word without the phonemes in seq, which are compared by
+    identity. w is not modified.
+    """
+    new_syllables = []
     for s in w.syllables:
-        s.phonemes = [p for p in s.phonemes if p not in seq]
-    w.phonemes = [p for s in w.syllables for p in s.phonemes]
+        new_syllables.append(delete_phonemes(s, seq))
+    return Word(new_syllables)
+
 
+def sequence_to_contour(w: Word, seq: List[Phoneme],
+                        matcher: Optional[fst.SequenceMatcher] = None
+                        ) -> Word:
+    """
+    Returns a new Word in which every occurrence of the phoneme sequence
+    seq, matched by symbol from left to right, is replaced by a single
+    Contour in the syllable of its first phoneme. A sequence may span
+    syllables. w is not modified.
 
-def sequence_to_contour(w: Word, seq: List[Phoneme]) -> Word:
+    matcher is a SequenceMatcher for seq; passing one saves building it
+    for every word.
+    """
     if len(seq) == 1:
         return w
+    if matcher is None:
+        matcher = fst.SequenceMatcher([[p.symbol for p in seq]])
+    phonemes = w.phonemes
+    matches = matcher.matches(matcher.table.ids_of(phonemes))
+    if not matches:
+        return w
+    # the contour starting at each matched index, and the indices it covers
+    contours = dict()
+    covered = set()
+    for idx, _ in matches:
+        contours[idx] = Contour(list(phonemes[idx:idx + len(seq)]))
+        covered.update(range(idx + 1, idx + len(seq)))
+
+    new_syllables = []
+    idx = 0
     for syllable in w.syllables:
-        for i in range(len(syllable.phonemes)):
-            try:
-                subseq = match_subsequence(w, syllable.phonemes[i], seq)
-            except IndexError:
-                break
-            if subseq is not None:
-                syllable.phonemes[i] = Contour(subseq)
-                delete_phonemes_from_word(w, subseq)
-    return w
+        new_phonemes = []
+        for p in syllable.phonemes:
+            if idx in contours:
+                new_phonemes.append(contours[idx])
+            elif idx not in covered:
+                new_phonemes.append(p)
+            idx += 1
+        new_syllables.append(rebuild_syllable(syllable, new_phonemes))
+    return Word(new_syllables)
 
 
 def change_feature(phone: Phone, name: str, value: str) -> Phone:
@@ -99,8 +128,14 @@ def change_features_map(phone: Phone, mapping: dict) -> Phone:
 
 def delete_phonemes(syllable: Syllable,
                     phonemes: Iterable[Phoneme]) -> Syllable:
-    syllable.phonemes = [p for p in syllable.phonemes if p not in phonemes]
-    return syllable
+    """
+    Returns a new Syllable without the given phonemes, which are compared
+    by identity. syllable is not modified.
+    """
+    phonemes = [p for p in phonemes]
+    return rebuild_syllable(syllable, [
+        p for p in syllable.phonemes if not any(p is q for q in phonemes)
+    ])
 
 
 def before_stress(td: Transducer) -> bool:
@@ -108,7 +143,7 @@ def before_stress(td: Transducer) -> bool:
     if wstr is None:
         return False
     else:
-        return (td.syllables.index(td.syllable) < wstr)
+        return td.syl_index < wstr
 
 
 def after_stress(td: Transducer) -> bool:
@@ -116,15 +151,33 @@ def after_stress(td: Transducer) -> bool:
     if wstr is None:
         return False
     else:
-        return (td.syllables.index(td.syllable) > wstr)
+        return td.syl_index > wstr
 
 
 def replace_phonemes(domain: List[Phone],
                      codomain: List[Phone]) -> Change:
 
     dom = Contour(domain)
-    return ComplexDomain(domain).do(lambda x: codomain).to(
-        This.forall(Phone)(lambda p: p.is_symbol(dom.symbol)))
+
+    def in_domain(p):
+        return p.is_symbol(dom.symbol)
+
+    # a tone is replaced on the tone tier, without visiting any segments
+    if len(domain) == 1 and domain[0].is_tone():
+        return Change().do(lambda x: codomain).to(
+            This.forall(Tone)(in_domain))
+
+    ch = ComplexDomain(domain).do(lambda x: codomain).to(
+        This.forall(Phone)(in_domain))
+    if len(domain) == 1:
+        ch = ch.with_rule(fst.SegmentRule(in_domain, lambda p: codomain))
+    else:
+        # single phones with the symbol of the whole sequence are replaced
+        # too, as they are when the change goes through a Contour
+        symbols = [p.symbol for p in domain]
+        ch = ch.with_rule(
+            fst.SequenceRule([symbols, [dom.symbol]], [codomain, codomain]))
+    return ch
 
 
 def is_diphthong(nucleus: Iterable[Phone], diphthong: Iterable[str]) -> bool:
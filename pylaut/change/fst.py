@@ -0,0 +1,539 @@
+"""
+Module defining compiled segmental rules. Rules of the form A -> B / X_Y,
+where A is a phoneme or feature bundle and the environment is made of
+relative expressions, can be compiled into a SegmentRule that rewrites a
+word in one linear pass over its phones, without going through a
+Transducer.
+
+Phones are interned as small integer ids by their symbol and features (see
+pylaut.language.phonology.phonetable).
+Every class test a rule makes (is this phone in the domain, does this
+phone match the environment at offset n) is memoized per id, so a rule
+behaves as a deterministic transducer over phone ids whose transitions are
+built lazily, the first time a phone is seen.
+
+Rules whose domain is a sequence of several phones are compiled into a
+SequenceRule, which finds every occurrence of its sequences with one
+Aho-Corasick automaton over phone ids.
+"""
+
+from collections import deque
+from typing import Callable, Sequence, Tuple
+
+from pylaut.language.phonology.phonetable import PHONES, PhoneTable
+from pylaut.language.phonology.word import Word, rebuild_syllable
+from pylaut.utils import flatten_partial
+
+
+def _bits(mask: int):
+    """
+    Yields the positions of the set bits of mask.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class PhoneClass(object):
+    """
+    A set of phones given by a predicate, with membership memoized per
+    phone id.
+    """
+
+    def __init__(self, pred: Callable):
+        self.pred = pred
+        self._memo = dict()
+
+        # bitsets over phone ids of the ids tested so far and of those
+        # found in the class
+        self.known = 0
+        self.mask = 0
+
+    def contains(self, pid: int, phone) -> bool:
+        try:
+            return self._memo[pid]
+        except KeyError:
+            result = bool(self.pred(phone))
+            self._memo[pid] = result
+            self.known |= 1 << pid
+            if result:
+                self.mask |= 1 << pid
+            return result
+
+    def intersects(self, signature: int, table) -> bool:
+        """
+        Returns whether any phone in the bitset signature is in the class.
+        """
+        for pid in _bits(signature & ~self.known):
+            self.contains(pid, table.phones[pid])
+        return bool(signature & self.mask)
+
+
+class Environment(object):
+    """
+    The compiled form of a relative expression: every test must hold, where
+    a test is a PhoneClass at an offset from the current phone, and the
+    current phone must be at every one of the absolute word positions in
+    `anchors`.
+    """
+
+    def __init__(self, tests: Sequence[Tuple[int, PhoneClass]] = (),
+                 anchors: Sequence[int] = ()):
+        self.tests = tuple(tests)
+        self.anchors = tuple(anchors)
+
+    def match(self, phones, ids, i) -> bool:
+        n = len(ids)
+        for index in self.anchors:
+            if not (-n <= index < n and i == index % n):
+                return False
+        for offset, cls in self.tests:
+            j = i + offset
+            if not 0 <= j < n or not cls.contains(ids[j], phones[j]):
+                return False
+        return True
+
+
+class Not(object):
+    def __init__(self, environment):
+        self.environment = environment
+
+    def match(self, phones, ids, i) -> bool:
+        return not self.environment.match(phones, ids, i)
+
+
+class AllOf(object):
+    def __init__(self, environments):
+        self.environments = tuple(environments)
+
+    def match(self, phones, ids, i) -> bool:
+        return all(e.match(phones, ids, i) for e in self.environments)
+
+
+class AnyOf(object):
+    def __init__(self, environments):
+        self.environments = tuple(environments)
+
+    def match(self, phones, ids, i) -> bool:
+        return any(e.match(phones, ids, i) for e in self.environments)
+
+
+def environment_of(condition):
+    """
+    Returns the compiled environment of a condition made by the PyLautLang
+    parser, or None if the condition cannot be compiled.
+    """
+    return getattr(condition, "environment", None)
+
+
+class SegmentRule(object):
+    """
+    A compiled rule that replaces every phone in `domain` whose environment
+    matches by the result of `output`, which may be a phone, a sequence of
+    phones, or an empty sequence to delete the phone. Environments are
+    matched against the input word, so all matching phones change at once,
+    exactly as in Transducer._run_ph.
+
+    Words that contain no phone of the domain are returned as they are,
+    which is decided by comparing bitsets (see Word.signature), and so are
+    words in which no phone matched. Syllables without a matching phone
+    keep their computed properties (see word.rebuild_syllable), and
+    rewritten words are frozen, so that their signature is only computed
+    once however many rules they go through. The number of words the rule
+    was run on and skipped is kept in hits and skips.
+    """
+
+    def __init__(self,
+                 domain: Callable,
+                 output: Callable,
+                 environments: Sequence = (),
+                 table: PhoneTable = PHONES):
+        self.domain = domain if isinstance(domain,
+                                           PhoneClass) else PhoneClass(domain)
+        self.output = output
+        self.environments = tuple(environments)
+        self.table = table
+        self._outputs = dict()
+        self.hits = 0
+        self.skips = 0
+
+    def when(self, environment) -> "SegmentRule":
+        """
+        Returns a new rule that also requires `environment`. The memo tables
+        of the domain are shared with the new rule.
+        """
+        return SegmentRule(self.domain, self.output,
+                           self.environments + (environment, ), self.table)
+
+    def _output(self, pid, phone):
+        try:
+            return self._outputs[pid]
+        except KeyError:
+            out = self.output(phone)
+            self._outputs[pid] = out
+            return out
+
+    def apply(self, word_obj: Word) -> Word:
+        if not self.domain.intersects(word_obj.signature(self.table),
+                                      self.table):
+            self.skips += 1
+            return word_obj
+        self.hits += 1
+
+        phones = word_obj.phonemes
+        ids = self.table.ids_of(phones)
+        domain = self.domain
+        environments = self.environments
+
+        new_syllables = []
+        changed = False
+        i = 0
+        for syllable in word_obj.syllables:
+            new_syllable = []
+            for phone in syllable.phonemes:
+                pid = ids[i]
+                if domain.contains(pid, phone) and all(
+                        e.match(phones, ids, i) for e in environments):
+                    new_syllable.append(self._output(pid, phone))
+                    changed = True
+                else:
+                    new_syllable.append(phone)
+                i += 1
+            new_syllables.append(rebuild_syllable(
+                syllable,
+                flatten_partial(x for x in new_syllable if x is not None)))
+        return Word(new_syllables).freeze() if changed else word_obj
+
+
+class SequenceMatcher(object):
+    """
+    An Aho-Corasick automaton that finds all occurrences of several
+    sequences of phone symbols in one pass over the phone ids of a word.
+    The automaton is built over symbols; its transitions on phone ids are
+    worked out the first time a state sees an id, and memoized.
+    """
+
+    def __init__(self, patterns: Sequence[Sequence[str]],
+                 table: PhoneTable = PHONES):
+        self.patterns = tuple(tuple(p) for p in patterns if p)
+        self.table = table
+
+        self._goto = [dict()]
+        self._fail = [0]
+        # the patterns that end at each state
+        self._out = [()]
+        for k, pattern in enumerate(self.patterns):
+            state = 0
+            for symbol in pattern:
+                nxt = self._goto[state].get(symbol)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append(dict())
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][symbol] = nxt
+                state = nxt
+            self._out[state] += (k, )
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, nxt in self._goto[state].items():
+                queue.append(nxt)
+                self._fail[nxt] = self._next(self._fail[state], symbol)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+        self._delta = dict()
+        firsts = frozenset(p[0] for p in self.patterns)
+        self.first = PhoneClass(lambda p: p.symbol in firsts)
+
+    def _next(self, state, symbol) -> int:
+        while state and symbol not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(symbol, 0)
+
+    def step(self, state: int, pid: int) -> int:
+        try:
+            return self._delta[state, pid]
+        except KeyError:
+            nxt = self._next(state, self.table.phones[pid].symbol)
+            self._delta[state, pid] = nxt
+            return nxt
+
+    def matches(self, ids: Sequence[int]) -> list:
+        """
+        Returns the occurrences of the patterns in a sequence of phone ids
+        as (start, pattern number) pairs. Occurrences do not overlap; where
+        they would, the one that starts first wins, and of those starting
+        at the same place the longest.
+        """
+        found = []
+        state = 0
+        for j, pid in enumerate(ids):
+            state = self.step(state, pid)
+            for k in self._out[state]:
+                found.append((j - len(self.patterns[k]) + 1, k))
+        found.sort(key=lambda m: (m[0], -len(self.patterns[m[1]])))
+
+        result = []
+        end = 0
+        for start, k in found:
+            if start >= end:
+                result.append((start, k))
+                end = start + len(self.patterns[k])
+        return result
+
+
+class SequenceRule(object):
+    """
+    A compiled rule that replaces sequences of phones, given as sequences
+    of symbols, by the phones of the corresponding output. Each occurrence
+    is replaced in the syllable of its first phone. Occurrences are found as by
+    SequenceMatcher.matches.
+
+    Environments are not supported, since the environment of a sequence
+    is not that of any one phone; when returns None.
+    """
+
+    def __init__(self, patterns: Sequence[Sequence[str]], outputs: Sequence,
+                 table: PhoneTable = PHONES):
+        self.matcher = SequenceMatcher(patterns, table)
+        self.outputs = tuple(outputs)
+        self.table = table
+        self.domain = self.matcher.first
+        self.hits = 0
+        self.skips = 0
+
+    def when(self, environment):
+        return None
+
+    def apply(self, word_obj: Word) -> Word:
+        if not self.domain.intersects(word_obj.signature(self.table),
+                                      self.table):
+            self.skips += 1
+            return word_obj
+        self.hits += 1
+
+        ids = self.table.ids_of(word_obj.phonemes)
+        matches = self.matcher.matches(ids)
+        if not matches:
+            return word_obj
+        outputs = {start: self.outputs[k] for start, k in matches}
+        covered = set(i for start, k in matches
+                      for i in range(start + 1,
+                                     start + len(self.matcher.patterns[k])))
+
+        new_syllables = []
+        i = 0
+        for syllable in word_obj.syllables:
+            new_syllable = []
+            for phone in syllable.phonemes:
+                if i in outputs:
+                    new_syllable.append(outputs[i])
+                elif i not in covered:
+                    new_syllable.append(phone)
+                i += 1
+            new_syllables.append(rebuild_syllable(
+                syllable,
+                flatten_partial(x for x in new_syllable if x is not None)))
+        return Word(new_syllables).freeze()
+
+
+def _classes_of(environment):
+    """
+    Yields every PhoneClass an environment tests.
+    """
+    if isinstance(environment, Environment):
+        for _, cls in environment.tests:
+            yield cls
+    elif isinstance(environment, Not):
+        yield from _classes_of(environment.environment)
+    else:
+        for e in environment.environments:
+            yield from _classes_of(e)
+
+
+def _single_phone(output):
+    """
+    Returns the output of a rule as a single phone, or None if it inserts
+    or deletes phones.
+    """
+    if output is None:
+        return None
+    if isinstance(output, (list, tuple)):
+        return output[0] if len(output) == 1 else None
+    return output
+
+
+class FusedRule(object):
+    """
+    Several SegmentRules applied in one pass, with the same result as
+    applying them one after the other.
+
+    In the single pass, each rule sees the output of the previous ones at
+    the current phone, but reads its environment from the input word. That
+    is only the same as sequential application if no earlier rule can make
+    a difference to the environment of a later one. This is checked per
+    phone id: following everything the rules can turn a phone into, every
+    environment class of every later rule must agree on all of them, and
+    no rule may insert or delete phones. Words containing a phone that
+    fails the check are rewritten by the rules one after the other.
+
+    Each phone is only tested against the rules that can change it, which
+    are worked out per phone id along with the check above. For the
+    branches of a conditional chain this makes a FusedRule an ordered
+    decision list: a phone goes through the branches in order, and only
+    continues past a branch that changed it if it is still in the domain.
+
+    Words containing no phone of any of the domains are skipped; hits and
+    skips count words run and skipped, like for SegmentRule. The hits and
+    skips of every rule are counted as well, as if it had been applied on
+    its own: a rule is run on a word if, by its turn, the word has a phone
+    of its domain.
+    """
+
+    def __init__(self, rules: Sequence[SegmentRule],
+                 table: PhoneTable = PHONES):
+        self.rules = tuple(rules)
+        self.table = table
+        self._env_classes = [
+            tuple(cls for e in r.environments for cls in _classes_of(e))
+            for r in self.rules
+        ]
+        self._safe = dict()
+        # the rules that can change a phone, given what earlier rules can
+        # turn it into
+        self._relevant = dict()
+        self.fused_words = 0
+        self.sequential_words = 0
+        self.skips = 0
+
+    def _is_safe(self, pid, phone) -> bool:
+        try:
+            return self._safe[pid]
+        except KeyError:
+            pass
+        safe = True
+        reachable = {pid: phone}
+        relevant = []
+        for rule, classes in zip(self.rules, self._env_classes):
+            for cls in classes:
+                if len({cls.contains(i, p)
+                        for i, p in reachable.items()}) > 1:
+                    safe = False
+                    break
+            if not safe:
+                break
+            for i, p in list(reachable.items()):
+                if rule.domain.contains(i, p):
+                    if not relevant or relevant[-1] is not rule:
+                        relevant.append(rule)
+                    out = _single_phone(rule._output(i, p))
+                    if out is None:
+                        safe = False
+                        break
+                    reachable[self.table.id_of(out)] = out
+            if not safe:
+                break
+        self._safe[pid] = safe
+        self._relevant[pid] = tuple(relevant)
+        return safe
+
+    def when(self, environment) -> "FusedRule":
+        """
+        Returns a new FusedRule whose rules all also require environment.
+        """
+        return FusedRule([r.when(environment) for r in self.rules],
+                         self.table)
+
+    @property
+    def hits(self) -> int:
+        return self.fused_words + self.sequential_words
+
+    def apply(self, word_obj: Word) -> Word:
+        # If no rule can change the input, none of them can change anything
+        sig = word_obj.signature(self.table)
+        if not any(r.domain.intersects(sig, self.table) for r in self.rules):
+            self.skips += 1
+            for rule in self.rules:
+                rule.skips += 1
+            return word_obj
+
+        phones = word_obj.phonemes
+        ids = self.table.ids_of(phones)
+        if not all(self._is_safe(i, p) for i, p in zip(ids, phones)):
+            self.sequential_words += 1
+            for rule in self.rules:
+                word_obj = rule.apply(word_obj)
+            return word_obj
+        self.fused_words += 1
+
+        new_syllables = []
+        changed = False
+        # the rules that found a phone of their domain
+        ran = set()
+        i = 0
+        for syllable in word_obj.syllables:
+            new_syllable = []
+            for phone in syllable.phonemes:
+                pid = ids[i]
+                for rule in self._relevant[pid]:
+                    if not rule.domain.contains(pid, phone):
+                        continue
+                    ran.add(rule)
+                    if all(e.match(phones, ids, i)
+                           for e in rule.environments):
+                        phone = _single_phone(rule._output(pid, phone))
+                        pid = self.table.id_of(phone)
+                        changed = True
+                new_syllable.append(phone)
+                i += 1
+            new_syllables.append(rebuild_syllable(syllable, new_syllable))
+        for rule in self.rules:
+            if rule in ran:
+                rule.hits += 1
+            else:
+                rule.skips += 1
+        return Word(new_syllables).freeze() if changed else word_obj
+
+
+def fuse(changes: Sequence) -> list:
+    """
+    Optimizes a sequence of changes for application one after the other.
+    ChangeGroups are unpacked, and every run of two or more consecutive
+    compiled changes becomes one FusedRule, and changes compiled to a
+    SequenceRule are replaced by it. Anything else is kept as it is.
+    All items of the result have an apply method.
+    """
+    program = []
+    run = []
+
+    def end_run():
+        if len(run) > 1:
+            program.append(FusedRule(run))
+        else:
+            program.extend(run)
+        run.clear()
+
+    for ch in _unpack(changes):
+        rule = getattr(ch, "compiled", None)
+        if isinstance(rule, SegmentRule):
+            run.append(rule)
+        elif isinstance(rule, SequenceRule):
+            end_run()
+            program.append(rule)
+        else:
+            end_run()
+            program.append(ch)
+    end_run()
+    return program
+
+
+def _unpack(changes):
+    for ch in changes:
+        merged = getattr(ch, "_merged", None)
+        if merged is not None:
+            yield from _unpack(merged)
+        else:
+            yield ch
@@ -0,0 +1,72 @@
+"""
+Module defining a memo table for applying sound changes. Many words of a
+lexicon share a phonetic form, and applying a change to a form always gives
+the same result as long as the change depends only on the word, so the
+result need only be computed once.
+"""
+
+from collections import OrderedDict
+from typing import Hashable
+
+DEFAULT_MEMO_SIZE = 2**16
+
+
+def is_pure(change) -> bool:
+    """
+    Returns whether a change (or sound law) depends only on the word it is
+    applied to. Changes made by library functions marked with lib.impure are
+    not.
+    """
+    return getattr(change, "pure", True)
+
+
+class ApplicationMemo(object):
+    """
+    A bounded table of the results of applying changes to words. Entries are
+    keyed by a key identifying the change, such as SoundLaw.uid, and the
+    structural key of the word (see Word.key), which tells apart words whose
+    phones differ in class or features. When the table is full, the
+    least recently used entry is evicted. Impure changes are always applied.
+
+    Sharing one memo between several runs, e.g. over a lexicon and a delta
+    lexicon derived from it, lets the runs share their results.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        self.maxsize = maxsize
+        self._table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self) -> None:
+        self._table.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def apply(self, change_key: Hashable, change, word_obj):
+        """
+        Returns change.apply(word_obj), from the table if it has been
+        computed before.
+        """
+        if self.maxsize == 0 or not is_pure(change):
+            return change.apply(word_obj)
+
+        key = (change_key, word_obj.key())
+        try:
+            result = self._table[key]
+        except KeyError:
+            pass
+        else:
+            self._table.move_to_end(key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = change.apply(word_obj)
+        self._table[key] = result
+        if len(self._table) > self.maxsize:
+            self._table.popitem(last=False)
+        return result
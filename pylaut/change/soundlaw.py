@@ -1,6 +1,8 @@
 import importlib
+import itertools
 import json as jm
-from pylaut.pylautlang import lib
+from pylaut.change import fst, memo
+from pylaut.pylautlang import ir, lib
 
 
 class MissingDataError(Exception):
@@ -20,8 +22,18 @@ class SoundLaw():
     A wrapper class for a set of sound changes.
     Includes all the nice human-readable information about a sound
     law one might want, and is crucially dated.
+
+    Every SoundLaw has a unique integer id, uid, under which its results are
+    memoized (see memo.ApplicationMemo).
+
+    Laws compiled from PyLautLang keep their intermediate representation in
+    ir and their source text in source. Such laws can be pickled: the
+    compiled changes are left out and compiled again from the IR when the
+    law is unpickled.
     """
 
+    _uids = itertools.count()
+
     def __init__(self,
                  change_repr,
                  changes,
@@ -39,9 +51,40 @@ class SoundLaw():
         self.sc_lib_version = sc_lib_version
         self.description = description
         self.name = name
+        self.uid = next(self._uids)
+        self._program = None
+        self.ir = None
+        self.source = None
 
         self.validate()
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_program"] = None
+        if self.ir is not None:
+            state["changes"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.uid = next(self._uids)
+        if self.changes is None and self.ir is not None:
+            # the parser imports this module
+            from pylaut.pylautlang import parser
+            law = parser.compile_ir(ir.Node("start", (self.ir, )),
+                                    self.sc_lib)[0]
+            self.changes = law.changes
+
+    def digest(self):
+        """
+        Returns a hex digest of the IR of the law and the name and version
+        of its library, or None if the law has no IR. Laws with the same
+        digest compile to the same changes.
+        """
+        if self.ir is None:
+            return None
+        return ir.digest(self.ir, self.sc_lib_name, self.sc_lib_version)
+
     @classmethod
     def from_json(cls, json_obj):
         if isinstance(json_obj, str):
@@ -144,9 +187,41 @@ class SoundLaw():
 
         return sc_lib
 
+    @property
+    def pure(self) -> bool:
+        """
+        Whether the law depends only on the words it is applied to.
+        """
+        return all(memo.is_pure(ch) for ch in self.changes)
+
+    @property
+    def program(self):
+        """
+        The changes of this law as they are applied: compatible compiled
+        changes are fused into single passes over the word (see fst.fuse).
+        """
+        if self._program is None:
+            self._program = fst.fuse(self.changes)
+        return self._program
+
+    def rule_stats(self):
+        """
+        Returns a list of (rule, hits, skips) for every compiled rule of
+        program: how many words it was run on, and how many it skipped
+        because they contain no phone its domain can match. The rules of a
+        fused step are listed one by one.
+        """
+        stats = []
+        for step in self.program:
+            if isinstance(step, fst.FusedRule):
+                stats.extend((r, r.hits, r.skips) for r in step.rules)
+            elif isinstance(step, (fst.SegmentRule, fst.SequenceRule)):
+                stats.append((step, step.hits, step.skips))
+        return stats
+
     def apply(self, word):
         new_word = word
-        for change in self.changes:
+        for change in self.program:
             new_word = change.apply(new_word)
         return new_word
 
@@ -184,3 +259,9 @@ class SoundLawGroup(SoundLaw):
         if as_dict:
             return obj
         return jm.dumps(obj, indent=2)
+
+    def __getstate__(self):
+        # the laws of a group are pickled on their own
+        state = super().__getstate__()
+        state["changes"] = self.changes
+        return state
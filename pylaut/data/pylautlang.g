@@ -59,8 +59,9 @@ words: (WORD ",")* WORD
 
 fcall: IDENTIFIER "(" (value ",")* [value] ")"
 index: entity "[" indexer "]"
+tier: feat_expr "[" indexer "]"
 member: entity "." IDENTIFIER
-?entity: member | index | IDENTIFIER
+?entity: member | index | tier | IDENTIFIER
 offset: "@" SIGNED_INT
 ?indexer: SIGNED_INT | offset
 
@@ -1,4 +1,7 @@
+from pylaut.change import fst
+from pylaut.change.memo import ApplicationMemo
 from pylaut.language.phonology import word, phonology
+from pylaut.language.phonology.syllabifier import Syllabifier
 import random
 import pathlib
 
@@ -12,6 +15,7 @@ class Lexicon(object):
         self.word_factory = None
 
         self.entries = list()
+        self._segment_index = None
 
     @classmethod
     def load(cls, file_path_or_name):
@@ -62,10 +66,11 @@ class Lexicon(object):
         # extract phonemes
         phonemes = set()
 
-        self.factory = word.WordFactory()
+        self.factory = word.WordFactory.shared()
 
-        for entry in self.entries:
-            entry.set_phonetic(self.factory.make_word(entry.ipa))
+        words = self.factory.make_words(entry.ipa for entry in self.entries)
+        for entry, w in zip(self.entries, words):
+            entry.set_phonetic(w)
 
         for entry in self.entries:
             for syllable in entry.phonetic.syllables:
@@ -79,9 +84,91 @@ class Lexicon(object):
         new.entries = self.entries + other.entries
         return new
 
-    def run_sound_changes(self, changes):
+    def segment_index(self):
+        """
+        Returns an inverted index from phone ids (see fst.PHONES) to the set
+        of positions in entries of the entries whose words contain that
+        phone. The index is built on first use; lexicons made by
+        run_sound_changes inherit it, updated for the changed words.
+        """
+        if self._segment_index is None:
+            index = dict()
+            for i, entry in enumerate(self.entries):
+                for pid in set(fst.PHONES.ids_of(entry.phonetic.phonemes)):
+                    index.setdefault(pid, set()).add(i)
+            self._segment_index = index
+        return self._segment_index
+
+    def run_sound_changes(self, changes, syllabifier=None, memo=None):
+        """
+        Runs a list of sound laws over every entry, returning a new Lexicon.
+        If a Syllabifier is given, words are resyllabified after every law.
+
+        The laws are applied one change at a time to the whole lexicon.
+        Compiled changes (see fst) only visit the entries that, according to
+        the segment index, contain a phone of their domain. Entries sharing
+        a form share the work through an ApplicationMemo, which is made for
+        this run unless one is passed in; pass ApplicationMemo(0) to turn
+        memoization off.
+        """
+        if any(not e.phonetic for e in self.entries):
+            raise ValueError("Could not run sound changes: "
+                             "no word objects instantiated.")
+        index = {
+            pid: set(entries)
+            for pid, entries in self.segment_index().items()
+        }
+        words = [e.phonetic for e in self.entries]
+
+        def update(i, new_word):
+            old_ids = set(fst.PHONES.ids_of(words[i].phonemes))
+            new_ids = set(fst.PHONES.ids_of(new_word.phonemes))
+            for pid in old_ids - new_ids:
+                index[pid].discard(i)
+            for pid in new_ids - old_ids:
+                index.setdefault(pid, set()).add(i)
+            words[i] = new_word
+
+        if memo is None:
+            memo = ApplicationMemo()
+
+        for law in changes:
+            uid = getattr(law, "uid", None)
+            for n, step in enumerate(getattr(law, "program", [law])):
+                domains = _domains(step)
+                if domains is None:
+                    candidates = range(len(words))
+                else:
+                    candidates = _candidates(index, domains)
+                for i in candidates:
+                    if uid is None:
+                        new_word = step.apply(words[i])
+                    else:
+                        new_word = memo.apply((uid, n), step, words[i])
+                    if new_word is not words[i]:
+                        update(i, new_word)
+            if syllabifier is not None:
+                words = [syllabifier.resyllabify(w) for w in words]
+
+        new = Lexicon()
+        for entry, w in zip(self.entries, words):
+            new_entry = LexiconEntry(entry.ipa, entry.orthography,
+                                     entry.gloss, entry.date)
+            new_entry.set_phonetic(word.intern_word(w))
+            new.add_entry(new_entry)
+        new._segment_index = index
+        return new
+
+    def resyllabify(self, syllabifier=None):
+        """
+        Returns a new Lexicon with every word divided into syllables anew.
+        Unless a Syllabifier is given, legal onsets, codas and polyphthongs
+        are learned from the current syllabification of this lexicon.
+        """
+        if syllabifier is None:
+            syllabifier = Syllabifier.from_lexicon(self)
         new = Lexicon()
-        new.entries = [e.run_sound_changes(changes) for e in self.entries]
+        new.entries = [e.resyllabify(syllabifier) for e in self.entries]
         return new
 
 
@@ -114,7 +201,12 @@ class LexiconEntry(object):
     def set_date(self, value, system):
         self.date = (value, system)
 
-    def run_sound_changes(self, changes):
+    def run_sound_changes(self, changes, syllabifier=None, memo=None):
+        """
+        Runs a list of sound laws over this entry, returning a new entry.
+        Results of sound laws are looked up in and added to memo, an
+        ApplicationMemo, if one is given.
+        """
         if not self.phonetic:
             raise ValueError("Could not run sound changes: "
                              "no word objects instantiated.")
@@ -123,6 +215,46 @@ class LexiconEntry(object):
                                self.date)
             w = self.phonetic
             for ch in changes:
-                w = ch.apply(w)
-            new.set_phonetic(w)
+                uid = getattr(ch, "uid", None)
+                if memo is None or uid is None:
+                    w = ch.apply(w)
+                else:
+                    w = memo.apply(uid, ch, w)
+                if syllabifier is not None:
+                    w = syllabifier.resyllabify(w)
+            new.set_phonetic(word.intern_word(w))
             return new
+
+    def resyllabify(self, syllabifier):
+        if not self.phonetic:
+            raise ValueError("Could not resyllabify: "
+                             "no word objects instantiated.")
+        new = LexiconEntry(self.ipa, self.orthography, self.gloss, self.date)
+        new.set_phonetic(
+            word.intern_word(syllabifier.resyllabify(self.phonetic)))
+        return new
+
+
+def _domains(step):
+    """
+    Returns the domains of a compiled change as a list of PhoneClasses, or
+    None if the change is not compiled and may change any word.
+    """
+    if isinstance(step, (fst.SegmentRule, fst.SequenceRule)):
+        return [step.domain]
+    if isinstance(step, fst.FusedRule):
+        return [r.domain for r in step.rules]
+    return None
+
+
+def _candidates(index, domains):
+    """
+    Returns the sorted positions of the entries in a segment index that
+    contain a phone of any of domains.
+    """
+    candidates = set()
+    for pid, entries in index.items():
+        phone = fst.PHONES.phones[pid]
+        if entries and any(d.contains(pid, phone) for d in domains):
+            candidates |= entries
+    return sorted(candidates)
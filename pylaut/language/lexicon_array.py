@@ -0,0 +1,183 @@
+"""
+Module defining a vectorized representation of a lexicon. All words of a
+lexicon are stored as one NumPy array of phone ids (see fst.PHONES), so that
+rules whose output depends only on the phone being changed can be applied to
+the whole lexicon at once with a lookup table. Other rules are applied word
+by word.
+
+NumPy is an optional dependency of PyLaut; this module can be imported
+without it, but LexiconArray cannot be used.
+"""
+
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pylaut.change import fst
+from pylaut.language import lexicon as lx
+from pylaut.language.phonology import word
+
+
+class LexiconArray(object):
+    """
+    The words of a lexicon as flat arrays:
+
+    ids holds the phone ids of all words one after the other, and
+    syllable_of the number of the syllable every phone belongs to.
+    Syllables are numbered across the whole lexicon; for every syllable,
+    syllable_word holds the number of its word and syllable_stressed
+    whether it is stressed. Syllables that lose all their phones are kept,
+    as they are by the Transducer. The tone tier is stored apart: tone_ids
+    holds the ids of all tones, and tone_syllable the syllable each is
+    anchored to.
+    """
+
+    def __init__(self, words: List[word.Word], table=fst.PHONES):
+        if np is None:
+            raise ImportError("LexiconArray requires NumPy.")
+        self.table = table
+        self.n_words = len(words)
+
+        ids = []
+        syllable_of = []
+        syllable_word = []
+        syllable_stressed = []
+        tone_ids = []
+        tone_syllable = []
+        for w_idx, w in enumerate(words):
+            for syllable in w.syllables:
+                s_idx = len(syllable_word)
+                syllable_word.append(w_idx)
+                syllable_stressed.append(syllable.is_stressed())
+                ids.extend(table.ids_of(syllable.phonemes))
+                syllable_of.extend([s_idx] * len(syllable.phonemes))
+                tone_ids.extend(table.ids_of(syllable.tones))
+                tone_syllable.extend([s_idx] * len(syllable.tones))
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.syllable_of = np.array(syllable_of, dtype=np.int64)
+        self.syllable_word = np.array(syllable_word, dtype=np.int64)
+        self.syllable_stressed = np.array(syllable_stressed, dtype=bool)
+        self.tone_ids = np.array(tone_ids, dtype=np.int64)
+        self.tone_syllable = np.array(tone_syllable, dtype=np.int64)
+
+    @classmethod
+    def from_lexicon(cls, lexicon, table=fst.PHONES):
+        return cls([e.phonetic for e in lexicon.entries], table)
+
+    def to_words(self) -> List[word.Word]:
+        phones = self.table.phones
+        syllables = [[] for _ in range(len(self.syllable_word))]
+        for pid, s_idx in zip(self.ids.tolist(), self.syllable_of.tolist()):
+            syllables[s_idx].append(phones[pid])
+        tones = [[] for _ in range(len(self.syllable_word))]
+        for pid, s_idx in zip(self.tone_ids.tolist(),
+                              self.tone_syllable.tolist()):
+            tones[s_idx].append(phones[pid])
+
+        words = [[] for _ in range(self.n_words)]
+        for s_idx, w_idx in enumerate(self.syllable_word.tolist()):
+            syllable = word.Syllable(syllables[s_idx], tones[s_idx])
+            if self.syllable_stressed[s_idx]:
+                syllable.set_stressed()
+            words[w_idx].append(syllable)
+        return [word.Word(syllables) for syllables in words]
+
+    def lookup_table(self, rule: fst.SegmentRule):
+        """
+        Returns the lookup table of a context-free rule: entry n is the id
+        phone n becomes, or -1 if it is deleted. Returns None if the rule
+        cannot be applied with a lookup table, because it has an environment
+        or inserts phones.
+        """
+        if rule.environments:
+            return None
+        lut = np.arange(len(self.table), dtype=np.int64)
+        for pid in np.unique(self.ids).tolist():
+            phone = self.table.phones[pid]
+            if not rule.domain.contains(pid, phone):
+                continue
+            out = rule._output(pid, phone)
+            if isinstance(out, (list, tuple)):
+                if len(out) > 1:
+                    return None
+                lut[pid] = self.table.id_of(out[0]) if out else -1
+            elif out is None:
+                lut[pid] = -1
+            else:
+                lut[pid] = self.table.id_of(out)
+        return lut
+
+    def apply_lookup_table(self, lut) -> None:
+        """
+        Maps every phone through a lookup table, then removes the deleted
+        ones.
+        """
+        new_ids = lut[self.ids]
+        keep = new_ids >= 0
+        if keep.all():
+            self.ids = new_ids
+        else:
+            self.ids = new_ids[keep]
+            self.syllable_of = self.syllable_of[keep]
+
+
+def _rules(step):
+    """
+    Returns the SegmentRules of a fused step, or None for any other step.
+    """
+    if isinstance(step, fst.FusedRule):
+        return list(step.rules)
+    return None
+
+
+def run_sound_changes(lexicon, changes, syllabifier=None):
+    """
+    Runs a list of sound laws over a lexicon like Lexicon.run_sound_changes
+    and returns a new Lexicon. Runs of context-free compiled rules are
+    applied to a LexiconArray of the whole lexicon; every other change is
+    applied word by word.
+    """
+    words = [e.phonetic for e in lexicon.entries]
+    array = None
+
+    for law in changes:
+        for step in getattr(law, "program", [law]):
+            rules = _rules(step)
+            if rules is None:
+                rules = [step]
+            # a fused step may only be partly context-free, so its rules
+            # are applied one at a time
+            for rule in rules:
+                lut = None
+                if (isinstance(rule, fst.SegmentRule)
+                        and not rule.environments):
+                    if array is None:
+                        array = LexiconArray(words)
+                    lut = array.lookup_table(rule)
+                if lut is not None:
+                    array.apply_lookup_table(lut)
+                    continue
+                if array is not None:
+                    words = array.to_words()
+                    array = None
+                words = [rule.apply(w) for w in words]
+        if syllabifier is not None:
+            if array is not None:
+                words = array.to_words()
+                array = None
+            words = [syllabifier.resyllabify(w) for w in words]
+
+    if array is not None:
+        words = array.to_words()
+
+    new = lx.Lexicon()
+    for entry, w in zip(lexicon.entries, words):
+        new_entry = lx.LexiconEntry(entry.ipa, entry.orthography, entry.gloss,
+                                    entry.date)
+        new_entry.set_phonetic(word.intern_word(w))
+        new.add_entry(new_entry)
+    return new
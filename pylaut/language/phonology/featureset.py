@@ -5,9 +5,11 @@ important, if not very glamorous, as it performs the unloved and thankless task
 of providing basic infrastructure.
 """
 
+import hashlib
 import json
 import pathlib
 import pkgutil
+import re
 from typing import List, Optional, Tuple, Dict, Any
 import yaml
 try:
@@ -16,6 +18,7 @@ except ImportError:
     from yaml import Loader
 
 import pylaut.utils as utils
+from pylaut.language.phonology.tokeniser import IPATokeniser, TIE_BARS
 
 
 class FeatureModel():
@@ -34,6 +37,10 @@ class FeatureModel():
     # the longest distance between features that get_ipa_from_features will
     # regard
     _IGNORE_DISTANCE_GREATER_THAN = 5
+    # features that a segment joined by a tie bar, such as an affricate,
+    # takes from its first part only (see get_features_from_ipa)
+    _TIE_MANNER_FEATURES = ("syllabic", "consonantal", "continuant",
+                            "sonorant")
 
     JSON_OBJECT_NAME = "featuremodel"
     JSON_VERSION_NO = "pre-alpha-1"
@@ -55,10 +62,32 @@ class FeatureModel():
         self.features = list()
         self._ipa_dict = dict()
         self._ipa_diacritics = dict()
+        # the features of segments joined by tie bars, filled in as they
+        # are looked up
+        self._ipa_ties = dict()
         self._config = dict()
+        # compiled lazily by the tokeniser property
+        self._tokeniser = None
+        # a hex digest of the feature set files, set when they are loaded
+        self.digest = None
 
         self.load_feature_set()
 
+    def __deepcopy__(self, memo):
+        # Feature models are never modified after loading, so copies of
+        # Phones can share them.
+        return self
+
+    @property
+    def tokeniser(self) -> IPATokeniser:
+        """
+        The IPATokeniser for this feature set, compiled on first use from its
+        segment and diacritic tables.
+        """
+        if getattr(self, "_tokeniser", None) is None:
+            self._tokeniser = IPATokeniser.from_feature_model(self)
+        return self._tokeniser
+
     def _load_feature_set_file(self, fname: str,
                                dir_path: Optional[str]) -> str:
         """
@@ -164,6 +193,13 @@ class FeatureModel():
         if ipa_files_raw:
             self._feature_set_ipa_lookup = True
 
+        # identifies the contents of the feature set, e.g. for caches of
+        # things built from it
+        digest = hashlib.sha256(feature_set_raw.encode('utf-8'))
+        for raw in ipa_files_raw or ():
+            digest.update((raw or '').encode('utf-8'))
+        self.digest = digest.hexdigest()
+
         # assign properties
         self.features = feature_set['features']
 
@@ -200,14 +236,27 @@ class FeatureModel():
         feature-set represented by this IPA. May throw a KeyError if the
         feature set has no value for a certain symbol.
 
+        Segments joined by a tie bar, such as t͡s, have the manner features
+        of their first part, and every other feature that is true of any of
+        their parts: t͡s is a sibilant stop, k͡p a labial and dorsal stop.
+
         :param str ipa_str: The IPA string to look up.
         :returns: The features as a list of feature values in canonical order.
         :return-type: List[str]
         """
-        ipa_char_features = self._ipa_dict[ipa_str[0]].copy()
-
-        if len(ipa_str) > 1:
-            for char in ipa_str[1:]:
+        if ipa_str not in self._ipa_dict and any(t in ipa_str
+                                                 for t in TIE_BARS):
+            return self._get_tied_features(ipa_str)
+        base = ipa_str[0]
+        # multi-character segments, such as affricates in some feature sets
+        for end in range(len(ipa_str), 1, -1):
+            if ipa_str[:end] in self._ipa_dict:
+                base = ipa_str[:end]
+                break
+        ipa_char_features = self._ipa_dict[base].copy()
+
+        if len(ipa_str) > len(base):
+            for char in ipa_str[len(base):]:
                 try:
                     dc_feats = self._ipa_diacritics[char]
                     for feat in dc_feats:
@@ -221,6 +270,25 @@ class FeatureModel():
                     raise KeyError(" {} not found in IPA lookup.".format(char))
         return ipa_char_features
 
+    def _get_tied_features(self, ipa_str: str) -> List[str]:
+        try:
+            return self._ipa_ties[ipa_str].copy()
+        except KeyError:
+            pass
+        parts = [part for part in re.split("[{}]".format(TIE_BARS), ipa_str)
+                 if part]
+        if not parts:
+            raise KeyError(" {} not found in IPA lookup.".format(ipa_str))
+        part_features = [self.get_features_from_ipa(p) for p in parts]
+        features = part_features[0].copy()
+        for i, name in enumerate(self.features):
+            if name in self._TIE_MANNER_FEATURES:
+                continue
+            if any(f[i] == self._TRUE_FEATURE for f in part_features):
+                features[i] = self._TRUE_FEATURE
+        self._ipa_ties[ipa_str] = features
+        return features.copy()
+
     def feature_hamming(self, feature_list, ipa_feature_list):
         """
         Takes in two lists of features, from the same feature set + in same
@@ -252,6 +320,11 @@ class FeatureModel():
         for ipa_char in self._ipa_dict:
             if self._ipa_dict[ipa_char] == feature_list:
                 matching_symbols += [ipa_char]
+        if not matching_symbols:
+            matching_symbols = [
+                ipa_str for ipa_str, features in self._ipa_ties.items()
+                if features == feature_list
+            ][:1]
 
         if len(matching_symbols) > 1:
             raise Exception("Multiple symbols match Phone: check feature set "
@@ -372,3 +445,26 @@ class FeatureModel():
                                 self.JSON_VERSION_NO))
 
         self.__dict__ = pre_fm
+
+
+_FEATURE_MODELS = dict()
+
+
+def get_feature_model(feature_set_file_name: str,
+                      feature_set_path: Optional[str] = None) -> FeatureModel:
+    """
+    Returns the FeatureModel for a feature set, loading it only the first
+    time it is asked for. Phones of the same feature set share this model.
+
+    :param str feature_set_file_name: The feature set to load.
+    :param Optional[str] feature_set_path: An optional directory to load from.
+    :returns: The shared FeatureModel.
+    :return-type: FeatureModel
+    """
+    key = (feature_set_file_name, feature_set_path)
+    try:
+        return _FEATURE_MODELS[key]
+    except KeyError:
+        fm = FeatureModel(feature_set_file_name, feature_set_path)
+        _FEATURE_MODELS[key] = fm
+        return fm
@@ -23,7 +23,7 @@ class MonoPhone(phone.Phone):
     _NAS_C_FEATURE = "nasal"
 
     def __init__(self, ipa_string=None):
-        super().__init__(featureset.FeatureModel('monophone'), ipa_string)
+        super().__init__(featureset.get_feature_model('monophone'), ipa_string)
         self.JSON_OBJECT_NAME = "Phone/MonoPhone"
         self.JSON_VERSION_NO = "MonoPhone-pre-alpha-1"
         if ipa_string:
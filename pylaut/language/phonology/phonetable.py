@@ -0,0 +1,48 @@
+"""
+Module defining a table interning phones as small integer ids, by their
+class, symbol and features. Ids key words (see Word.key) and the memo tables
+of compiled rules (see pylaut.change.fst), and PHONES is the table shared by
+the whole process.
+"""
+
+import weakref
+from typing import Sequence, Tuple
+
+
+class PhoneTable(object):
+    """
+    Interns phones as integer ids. Phones with the same symbol and features
+    get the same id. Phones must not be modified in place once they have
+    been given an id.
+    """
+
+    def __init__(self):
+        self._ids = dict()
+        self._by_phone = weakref.WeakKeyDictionary()
+        # one phone for every id, to test ids against rules
+        self.phones = []
+
+    def __len__(self):
+        return len(self._ids)
+
+    def id_of(self, phone) -> int:
+        try:
+            return self._by_phone[phone]
+        except KeyError:
+            pass
+        key = (type(phone), phone.symbol,
+               tuple(sorted(phone.features.items())))
+        try:
+            pid = self._ids[key]
+        except KeyError:
+            pid = len(self._ids)
+            self._ids[key] = pid
+            self.phones.append(phone)
+        self._by_phone[phone] = pid
+        return pid
+
+    def ids_of(self, phones: Sequence) -> Tuple[int, ...]:
+        return tuple(self.id_of(p) for p in phones)
+
+
+PHONES = PhoneTable()
@@ -0,0 +1,298 @@
+"""
+Module defining a syllabifier for PyLaut words. Syllable boundaries are found
+using the sonority sequencing principle together with the maximal onset
+principle. Legal onsets, codas and polyphthongs can be learned from existing
+words, which lets the syllabifier follow the phonotactics of a particular
+language rather than just a universal sonority scale.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from pylaut.language.phonology import word
+from pylaut.language.phonology.phonology import Phoneme
+
+# Phones at or above this sonority are treated as vowels, see get_sonority
+VOWEL_SONORITY = 10
+HIGH_VOWEL_SONORITY = 11
+
+
+class Syllabifier(object):
+    """
+    Splits sequences of phones into syllables.
+
+    Every vowel is a syllable nucleus, except that adjacent vowels are joined
+    into a single polyphthongal nucleus if they are a legal polyphthong.
+    Consonants between two nuclei go to the onset of the second syllable for
+    as long as they form a legal onset; the rest form the coda of the first.
+
+    If no onsets, codas or nuclei have been learned, onsets must rise in
+    sonority, codas must fall in sonority, and a non-high vowel followed by
+    a high vowel forms a diphthong. Single consonants are always legal
+    onsets and codas.
+
+    All lookups are precomputed or memoized: sonorities by symbol, and the
+    syllable lengths for every sequence of symbols that has been split once.
+    """
+
+    def __init__(self,
+                 phoneme_cls=Phoneme,
+                 onsets: Optional[Iterable[Tuple[str, ...]]] = None,
+                 codas: Optional[Iterable[Tuple[str, ...]]] = None,
+                 nuclei: Optional[Iterable[Tuple[str, ...]]] = None):
+        self.phoneme_cls = phoneme_cls
+        self.onsets = set(onsets) if onsets is not None else None
+        self.codas = set(codas) if codas is not None else None
+        self.nuclei = set(nuclei) if nuclei is not None else None
+
+        self._sonority = dict()
+        self._splits = dict()
+
+    @classmethod
+    def from_phonology(cls, phonology):
+        """
+        Creates a syllabifier for the phonemes of a Phonology. Since a
+        Phonology does not record phonotactics, legality of onsets and codas
+        is decided by sonority alone.
+        """
+        new = cls(phoneme_cls=phonology.phoneme_cls)
+        for phoneme in phonology.phonemes:
+            new.sonority(phoneme)
+        return new
+
+    @classmethod
+    def from_words(cls, words, phoneme_cls=Phoneme):
+        """
+        Creates a syllabifier that learns legal onsets, codas and polyphthongs
+        from already syllabified words.
+        """
+        new = cls(phoneme_cls=phoneme_cls, onsets=(), codas=(), nuclei=())
+        for w in words:
+            for syllable in w.syllables:
+                for phoneme in syllable.phonemes:
+                    new.sonority(phoneme)
+                try:
+                    onset, nucleus, coda = syllable.get_structure()
+                except Exception:
+                    # Malformed syllables teach us nothing
+                    continue
+                new.onsets.add(tuple(p.symbol for p in onset))
+                new.nuclei.add(tuple(p.symbol for p in nucleus))
+                new.codas.add(tuple(p.symbol for p in coda))
+        return new
+
+    @classmethod
+    def from_lexicon(cls, lexicon, phoneme_cls=None):
+        """
+        Creates a syllabifier that learns from the words in a Lexicon. Its
+        phones are of phoneme_cls, or else of the phoneme class of the
+        phonology of the lexicon, if it has one.
+        """
+        if phoneme_cls is None:
+            phoneme_cls = getattr(lexicon.phonology, "phoneme_cls", Phoneme)
+        return cls.from_words(
+            (e.phonetic for e in lexicon.entries if e.phonetic),
+            phoneme_cls=phoneme_cls)
+
+    def sonority(self, phone) -> int:
+        """
+        Returns the sonority of a phone (or an IPA symbol), looking it up in
+        the precomputed table first.
+        """
+        symbol = phone if isinstance(phone, str) else phone.symbol
+        try:
+            return self._sonority[symbol]
+        except KeyError:
+            pass
+        if isinstance(phone, str):
+            phone = self.phoneme_cls(phone)
+        children = getattr(phone, "children", None)
+        if children:
+            son = max(self.sonority(c) for c in children)
+        else:
+            son = phone.get_sonority()
+        self._sonority[symbol] = son
+        return son
+
+    def is_legal_onset(self, cluster: Tuple[str, ...]) -> bool:
+        if len(cluster) < 2:
+            return True
+        if self.onsets is not None:
+            return cluster in self.onsets
+        sons = [self._sonority[s] for s in cluster]
+        return all(a < b for a, b in zip(sons, sons[1:]))
+
+    def is_legal_coda(self, cluster: Tuple[str, ...]) -> bool:
+        if len(cluster) < 2:
+            return True
+        if self.codas is not None:
+            return cluster in self.codas
+        sons = [self._sonority[s] for s in cluster]
+        return all(a > b for a, b in zip(sons, sons[1:]))
+
+    def is_legal_nucleus(self, vowels: Tuple[str, ...]) -> bool:
+        if len(vowels) < 2:
+            return True
+        if self.nuclei is not None:
+            return vowels in self.nuclei
+        sons = [self._sonority[s] for s in vowels]
+        return all(b == HIGH_VOWEL_SONORITY and a != HIGH_VOWEL_SONORITY
+                   for a, b in zip(sons, sons[1:]))
+
+    def _find_nuclei(self, symbols: Tuple[str, ...]) -> List[Tuple[int, int]]:
+        """
+        Returns the nuclei of a sequence of symbols as (start, end) index
+        pairs.
+        """
+        nuclei = []
+        i = 0
+        while i < len(symbols):
+            if self._sonority[symbols[i]] < VOWEL_SONORITY:
+                i += 1
+                continue
+            end = i + 1
+            while (end < len(symbols)
+                   and self._sonority[symbols[end]] >= VOWEL_SONORITY
+                   and self.is_legal_nucleus(symbols[i:end + 1])):
+                end += 1
+            nuclei.append((i, end))
+            i = end
+        return nuclei
+
+    def _split_cluster(self, cluster: Tuple[str, ...]) -> int:
+        """
+        Returns the number of consonants of an intervocalic cluster that
+        belong to the coda of the preceding syllable. The onset of the
+        following syllable is made as long as the coda it leaves behind
+        allows; if no split leaves a legal coda, the longest legal onset is
+        taken regardless.
+        """
+        fallback = None
+        for coda_len in range(len(cluster) + 1):
+            if not self.is_legal_onset(cluster[coda_len:]):
+                continue
+            if self.is_legal_coda(cluster[:coda_len]):
+                return coda_len
+            if fallback is None:
+                fallback = coda_len
+        return len(cluster) if fallback is None else fallback
+
+    def split_symbols(self, symbols: Sequence[str]) -> Tuple[int, ...]:
+        """
+        Computes the syllabification of a sequence of IPA symbols.
+
+        :returns: A tuple of syllable lengths.
+        """
+        symbols = tuple(symbols)
+        try:
+            return self._splits[symbols]
+        except KeyError:
+            pass
+
+        for s in symbols:
+            self.sonority(s)
+        nuclei = self._find_nuclei(symbols)
+
+        if len(nuclei) < 2:
+            lengths = (len(symbols), )
+        else:
+            boundaries = []
+            for (_, prev_end), (next_start, _) in zip(nuclei, nuclei[1:]):
+                cluster = symbols[prev_end:next_start]
+                boundaries.append(prev_end + self._split_cluster(cluster))
+            starts = [0] + boundaries
+            ends = boundaries + [len(symbols)]
+            lengths = tuple(e - s for s, e in zip(starts, ends))
+
+        self._splits[symbols] = lengths
+        return lengths
+
+    def split(self, phones: Sequence) -> List[List]:
+        """
+        Splits a sequence of phones into a list of syllables, each one a list
+        of phones.
+        """
+        for p in phones:
+            self.sonority(p)
+        lengths = self.split_symbols(p.symbol for p in phones)
+        syllables = []
+        start = 0
+        for length in lengths:
+            syllables.append(list(phones[start:start + length]))
+            start += length
+        return syllables
+
+    def syllabify(self, segments: Sequence[str], sep: str = ".") -> List[str]:
+        """
+        Syllabifies a sequence of IPA segments, returning the segments with
+        `sep` inserted at every syllable boundary.
+        """
+        lengths = self.split_symbols(segments)
+        out = []
+        start = 0
+        for length in lengths:
+            if out:
+                out.append(sep)
+            out.extend(segments[start:start + length])
+            start += length
+        return out
+
+    def resyllabify(self, word_obj: "word.Word") -> "word.Word":
+        """
+        Returns a new Word with the phones of word_obj divided into syllables
+        anew. Stress stays on the syllable containing the nucleus of the
+        previously stressed syllable, and so do the tones of each syllable.
+        """
+        phones = word_obj.phonemes
+        stressed = None
+        # the span of every old syllable with tones, and its tones
+        toned = []
+        start = 0
+        for syllable in word_obj.syllables:
+            if syllable.is_stressed():
+                stressed = (start, start + len(syllable))
+            if syllable.tones:
+                toned.append(((start, start + len(syllable)), syllable.tones))
+            start += len(syllable)
+
+        syllables = []
+        start = 0
+        for segs in self.split(phones):
+            end = start + len(segs)
+            tones = []
+            remaining = []
+            for span, syl_tones in toned:
+                if self._takes_stress(phones, span, start, end):
+                    tones.extend(syl_tones)
+                else:
+                    remaining.append((span, syl_tones))
+            toned = remaining
+            syl = word.Syllable(segs, tones)
+            if stressed is not None and self._takes_stress(
+                    phones, stressed, start, end):
+                syl.set_stressed()
+                stressed = None
+            syllables.append(syl)
+            start = end
+        # tones of syllables that had no phones are kept on the last one
+        if toned and syllables:
+            syllables[-1].tones += tuple(t for _, ts in toned for t in ts)
+        return word.Word(syllables)
+
+    def _takes_stress(self, phones, stressed, start, end) -> bool:
+        old_start, old_end = stressed
+        for i in range(max(start, old_start), min(end, old_end)):
+            if self.sonority(phones[i]) >= VOWEL_SONORITY:
+                return True
+        # No vowel in the old stressed syllable: fall back to its first phone
+        return start <= old_start < end and not any(
+            self.sonority(p) >= VOWEL_SONORITY
+            for p in phones[old_start:old_end])
+
+    def resyllabify_all(self,
+                        words: Iterable["word.Word"]) -> List["word.Word"]:
+        """
+        Resyllabifies every word of an iterable. Splits are memoized by
+        phone sequence (see split_symbols), so words sharing a phone
+        sequence are only split once.
+        """
+        return [self.resyllabify(w) for w in words]
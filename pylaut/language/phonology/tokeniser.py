@@ -0,0 +1,105 @@
+"""
+Module defining a compiled tokeniser for IPA strings. A tokeniser is built
+once from the segment and diacritic tables of a feature set (see
+FeatureModel.tokeniser) and can then split any number of strings into
+segments in a single regular expression pass each.
+"""
+
+import re
+from typing import Iterable, List, Tuple
+
+TIE_BARS = "͜͡"
+SYLLABLE_BREAK = "."
+STRESS_MARKS = "'ˈ"
+
+
+class IPATokeniser(object):
+    """
+    Splits IPA strings into segments. Base glyphs are matched against the
+    segments of a feature set by longest match, so multi-character segments
+    are kept whole. Any number of diacritics are attached to the preceding
+    base glyph, and glyphs joined by a tie bar form a single segment.
+    Characters that are not known segments are treated as single-character
+    segments; diacritics without a base glyph are dropped.
+    """
+
+    def __init__(self, segments: Iterable[str], diacritics: Iterable[str]):
+        self.segments = frozenset(segments)
+        self.diacritics = frozenset(diacritics)
+
+        special = "".join(self.diacritics) + TIE_BARS + SYLLABLE_BREAK + \
+            STRESS_MARKS + "\n"
+        bases = sorted((s for s in self.segments if len(s) > 1),
+                       key=len,
+                       reverse=True)
+        base = "|".join([re.escape(b) for b in bases] +
+                        ["[^{}\\s]".format(re.escape(special))])
+        if self.diacritics:
+            dia = "[{}]*".format(re.escape("".join(self.diacritics)))
+        else:
+            dia = ""
+        unit = "(?:{})(?:{})".format(base, dia)
+        segment = "{unit}(?:[{ties}]{unit})*".format(
+            unit=unit, ties=re.escape(TIE_BARS))
+
+        self._regex = re.compile(
+            "(?P<seg>{})|(?P<brk>[{}])|(?P<stress>[{}])|(?P<nl>\n)".format(
+                segment, re.escape(SYLLABLE_BREAK), re.escape(STRESS_MARKS)))
+
+    @classmethod
+    def from_feature_model(cls, feature_model):
+        return cls(feature_model._ipa_dict.keys(),
+                   feature_model._ipa_diacritics.keys())
+
+    def tokenise(self, s: str) -> Tuple[str, ...]:
+        """
+        Splits an IPA string into a flat tuple of segments, ignoring syllable
+        breaks and stress marks.
+        """
+        return tuple(m.group("seg") for m in self._regex.finditer(s)
+                     if m.lastgroup == "seg")
+
+    def tokenise_syllables(self, s: str) -> Tuple[Tuple[str, ...], ...]:
+        """
+        Splits an IPA string into syllables at "." and before stress marks.
+        Returns a tuple of syllables, each a tuple of segments; the first
+        segment of a stressed syllable is the stress mark. Line breaks are
+        ignored, like other whitespace.
+        """
+        return self._tokenise_lines(s.replace("\n", " "))[0]
+
+    def tokenise_many(self, strings: Iterable[str]
+                      ) -> List[Tuple[Tuple[str, ...], ...]]:
+        """
+        Tokenises many IPA strings at once, such as all words of a lexicon.
+        The strings are scanned in a single pass, joined by line breaks;
+        line breaks within the strings are ignored, as in
+        tokenise_syllables. Returns a list with the output of
+        tokenise_syllables for every string.
+        """
+        return self._tokenise_lines("\n".join(
+            s.replace("\n", " ") for s in strings))
+
+    def _tokenise_lines(self, text: str):
+        lines = []
+        syllables = []
+        current = []
+        for m in self._regex.finditer(text):
+            kind = m.lastgroup
+            if kind == "seg":
+                current.append(m.group(kind))
+            elif kind == "stress":
+                if current:
+                    syllables.append(tuple(current))
+                current = [m.group(kind)]
+            else:
+                if current:
+                    syllables.append(tuple(current))
+                current = []
+                if kind == "nl":
+                    lines.append(tuple(syllables))
+                    syllables = []
+        if current:
+            syllables.append(tuple(current))
+        lines.append(tuple(syllables))
+        return lines
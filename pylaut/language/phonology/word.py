@@ -5,12 +5,143 @@ class for producing them. These are important for the sound change machinery
 as well as any eventual automagical phonological analysis.
 """
 
+import itertools
+import weakref
+from collections import OrderedDict, namedtuple
 from copy import deepcopy
-from typing import Optional
+from typing import Hashable, Iterable, List, Optional, Tuple
 
+from pylaut.language.phonology.phonetable import PHONES
 from pylaut.language.phonology.phonology import Phonology, Phoneme
-from pylaut.utils import replace
-from pylaut.tokenise_ipa import tokenise_ipa, syllabify
+from pylaut.tokenise_ipa import syllabify
+from pylaut.language.phonology.syllabifier import Syllabifier
+
+
+class PhonemeList(list):
+    """
+    A list of phonemes that notifies the Syllable it belongs to whenever it is
+    modified in place, so that the Syllable can invalidate whatever it has
+    computed from its phonemes. Modifying the phonemes of a frozen Syllable
+    raises a TypeError.
+    """
+
+    def __init__(self, phonemes=(), owner=None):
+        super().__init__(phonemes)
+        self._owner = owner
+
+    def __reduce_ex__(self, protocol):
+        # The owner re-attaches itself on unpickling/copying, see
+        # Syllable.__setstate__.
+        return (list, (list(self), ))
+
+    def _check(self):
+        if self._owner is not None and self._owner.frozen:
+            raise TypeError(
+                "Cannot modify frozen syllable {}".format(self._owner))
+
+    def _touch(self):
+        if self._owner is not None:
+            self._owner.touch()
+
+    def __setitem__(self, key, value):
+        self._check()
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key):
+        self._check()
+        super().__delitem__(key)
+        self._touch()
+
+    def __iadd__(self, other):
+        self._check()
+        ret = super().__iadd__(other)
+        self._touch()
+        return ret
+
+    def __imul__(self, n):
+        self._check()
+        ret = super().__imul__(n)
+        self._touch()
+        return ret
+
+    def append(self, phoneme):
+        self._check()
+        super().append(phoneme)
+        self._touch()
+
+    def extend(self, phonemes):
+        self._check()
+        super().extend(phonemes)
+        self._touch()
+
+    def insert(self, index, phoneme):
+        self._check()
+        super().insert(index, phoneme)
+        self._touch()
+
+    def pop(self, index=-1):
+        self._check()
+        ret = super().pop(index)
+        self._touch()
+        return ret
+
+    def remove(self, phoneme):
+        self._check()
+        super().remove(phoneme)
+        self._touch()
+
+    def clear(self):
+        self._check()
+        super().clear()
+        self._touch()
+
+    def sort(self, *args, **kwargs):
+        self._check()
+        super().sort(*args, **kwargs)
+        self._touch()
+
+    def reverse(self):
+        self._check()
+        super().reverse()
+        self._touch()
+
+
+class Boundary(object):
+    """
+    A word or syllable boundary. Transducers return a boundary for positions
+    outside the word or syllable (see Transducer.segment_at), so conditions
+    at the edges need no special cases. A boundary has no features and is
+    neither a vowel nor a consonant; its symbol is "#" or ".".
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def __repr__(self):
+        return "".join(["/", self.symbol, "/"])
+
+    def is_symbol(self, ipa_string):
+        return self.symbol == ipa_string
+
+    def feature_is(self, feature, value):
+        return False
+
+    def is_tone(self):
+        return False
+
+    def is_vowel(self):
+        return False
+
+    def is_consonant(self):
+        return False
+
+    def copy(self):
+        return self
+
+
+WORD_BOUNDARY = Boundary("#")
+SYLLABLE_BOUNDARY = Boundary(".")
 
 
 class Syllable(object):
@@ -18,13 +149,116 @@ class Syllable(object):
     A class that models a Syllable. This concept is somewhat tricky to define
     cross-linguistically, but as far as we are concerned, it is a sonority peak
     surrounded optionally by less sonorous phonemes.
+
+    Properties derived from the phonemes of the syllable (structure, pattern,
+    weight, clusters, nuclei) are cached. Every cached value is stamped with
+    the version of the syllable it was computed from, and the version is
+    bumped by every modification of the phonemes, whether by assignment or
+    in place. Sound changes carry the cached values over to the new word
+    for syllables they leave unchanged (see rebuild_syllable).
+
+    Syllables belonging to a frozen Word are frozen as well and may not be
+    modified any more; use copy() to obtain a modifiable one.
+
+    Tones are kept apart from the segments, on the tone tier of the word:
+    tones holds the tones anchored to the syllable, in order. Tones among
+    the phonemes a syllable is made from are moved there, unless the tones
+    are given explicitly, in which case the phonemes must not contain any.
     """
 
-    def __init__(self, phonemes):
-        self.phonemes = [p for p in phonemes if p is not None]
+    def __init__(self, phonemes, tones=None):
+        self._version = 0
+        self._cache = dict()
+        self.frozen = False
+        phonemes = [p for p in phonemes if p is not None]
+        if tones is None:
+            tones = [p for p in phonemes if p.is_tone()]
+            if tones:
+                phonemes = [p for p in phonemes if not p.is_tone()]
+        self.phonemes = phonemes
+        self.tones = tuple(tones)
         self.stressed = False
         self.word_position = None
-        self.structure = None
+
+    @property
+    def phonemes(self):
+        return self._phonemes
+
+    @phonemes.setter
+    def phonemes(self, phonemes):
+        if self.frozen:
+            raise TypeError("Cannot modify frozen syllable {}".format(self))
+        self._phonemes = PhonemeList(phonemes, self)
+        self.touch()
+
+    @property
+    def version(self):
+        """
+        A counter that is incremented every time the phonemes of this
+        syllable change.
+        """
+        return self._version
+
+    @property
+    def structure(self):
+        """
+        The cached (onset, nucleus, coda) triple, or None if it has not been
+        computed for the current version of the syllable.
+        """
+        entry = self._cache.get("structure")
+        if entry is not None and entry[0] == self._version:
+            return entry[1]
+        return None
+
+    def touch(self):
+        """
+        Marks the syllable as modified, invalidating all cached properties.
+        """
+        self._version += 1
+
+    def _cached(self, key, compute):
+        """
+        Returns the value cached under key if it was computed from the
+        current version of the syllable, otherwise computes and caches it.
+        """
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == self._version:
+            return entry[1]
+        value = compute()
+        self._cache[key] = (self._version, value)
+        return value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_phonemes"] = list(self._phonemes)
+        state["_cache"] = dict()
+        return state
+
+    def __setstate__(self, state):
+        phonemes = state.pop("_phonemes")
+        self.__dict__.update(state)
+        self._phonemes = PhonemeList(phonemes, self)
+
+    def freeze(self):
+        """
+        Makes the syllable immutable.
+        """
+        self.frozen = True
+
+    def thaw(self):
+        """
+        Returns a modifiable copy of the syllable that shares its phonemes
+        and the properties already computed from them.
+        """
+        new = Syllable(self.phonemes, self.tones)
+        new.stressed = self.stressed
+        new.word_position = self.word_position
+        new._cache = {
+            k: (new._version, v)
+            for k, (version, v) in self._cache.items()
+            if version == self._version
+        }
+        return new
 
     def __eq__(self, other):
         return repr(self) == repr(other)
@@ -40,7 +274,9 @@ class Syllable(object):
         return len(self.phonemes)
 
     def copy(self):
-        return deepcopy(self)
+        new = deepcopy(self)
+        new.frozen = False
+        return new
 
     def to_json(self):
         pass
@@ -55,6 +291,9 @@ class Syllable(object):
         for phoneme in self.phonemes:
             output += [phoneme.symbol]
 
+        for tone in self.tones:
+            output += [tone.symbol]
+
         if self.word_position not in ["final", "monosyllable"]:
             output += ["-"]
 
@@ -64,9 +303,13 @@ class Syllable(object):
         return self.stressed
 
     def set_stressed(self):
+        if self.frozen:
+            raise TypeError("Cannot modify frozen syllable {}".format(self))
         self.stressed = True
 
     def set_unstressed(self):
+        if self.frozen:
+            raise TypeError("Cannot modify frozen syllable {}".format(self))
         self.stressed = False
 
     def set_word_position(self, position):
@@ -116,6 +359,9 @@ class Syllable(object):
         this relies on phonemes knowing their own sonority, which may be an
         architectural problem in the future.
         """
+        return self._cached("nuclei", self._find_nuclei)
+
+    def _find_nuclei(self):
         sonorities = [(ph, ph.get_sonority()) for ph in self.phonemes]
         # check to see if there are phones w/ sonorities >= 10
         if max(sonorities, key=lambda x: x[1])[1] >= 10:
@@ -155,59 +401,53 @@ class Syllable(object):
         return len(self.find_nuclei())
 
     def get_structure(self):
-        if self.structure is not None:
-            return self.structure
+        return self._cached("structure", self._compute_structure)
+
+    def _compute_structure(self):
+        nuclei_num = self.count_nuclei()
+        if nuclei_num < 1:
+            raise Exception("Syllable {} has no nucleus!".format(self))
+        elif nuclei_num > 1:
+            raise Exception("Syllable {} has {} nuclei!".format(
+                self, nuclei_num))
+
+        non_tones = self.phonemes
+
+        onset, nucleus, coda = [], [], []
+        if self.contains_vowel():  # the job is easier!
+            n, c = False, False
+            for i, ph in enumerate(non_tones):
+                # we haven"t triggered either nucleus or coda bit + is C
+                if not n and not c and ph.is_consonant():
+                    onset += [ph]
+                    # we haven't triggered nucleus or coda bit + is V
+                elif not n and not c and ph.is_vowel():
+                    n = True
+                    nucleus += [ph]
+                    # we HAVE triggered nucleus but not coda bit + is V
+                elif n and not c and ph.is_vowel():
+                    nucleus += [ph]
+                    # we HAVE triggered nucleus but not coda bit + is V
+                elif n and not c and ph.is_consonant():
+                    c = True
+                    coda += [ph]
+                    # nucleus and coda bit both triggered, all consonants
+                    # now go in coda
+                elif n and c and ph.is_consonant():
+                    coda += [ph]
+                    # this would mean multiple nuclei + the first part of
+                    # this is supposed to check for this!
+                elif n and c and ph.is_vowel():
+                    raise Exception("Vowel {} found in coda of {}".format(
+                        ph, self))
         else:
-            nuclei_num = self.count_nuclei()
-            if nuclei_num < 1:
-                raise Exception("Syllable {} has no nucleus!".format(self))
-            elif nuclei_num > 1:
-                raise Exception("Syllable {} has {} nuclei!".format(
-                    self, nuclei_num))
-            else:
-                pass
-
-            non_tones = list(filter(lambda p: not p.is_tone(), self.phonemes))
-
-            onset, nucleus, coda = [], [], []
-            if self.contains_vowel():  # the job is easier!
-                n, c = False, False
-                for i, ph in enumerate(non_tones):
-                    # we haven"t triggered either nucleus or coda bit + is C
-                    if not n and not c and ph.is_consonant():
-                        onset += [ph]
-                        # we haven't triggered nucleus or coda bit + is V
-                    elif not n and not c and ph.is_vowel():
-                        n = True
-                        nucleus += [ph]
-                        # we HAVE triggered nucleus but not coda bit + is V
-                    elif n and not c and ph.is_vowel():
-                        nucleus += [ph]
-                        # we HAVE triggered nucleus but not coda bit + is V
-                    elif n and not c and ph.is_consonant():
-                        c = True
-                        coda += [ph]
-                        # nucleus and coda bit both triggered, all consonants
-                        # now go in coda
-                    elif n and c and ph.is_consonant():
-                        coda += [ph]
-                        # this would mean multiple nuclei + the first part of
-                        # this is supposed to check for this!
-                    elif n and c and ph.is_vowel():
-                        raise Exception("Vowel {} found in coda of {}".format(
-                            ph, self))
-            else:
-                nc = self.find_nuclei()[0]
-                nucleus.append(nc)
-                ncidx = non_tones.index(nc)
-                onset = non_tones[:ncidx]
-                try:
-                    coda = non_tones[ncidx + 1:]
-                except IndexError:
-                    pass
+            nc = self.find_nuclei()[0]
+            nucleus.append(nc)
+            ncidx = non_tones.index(nc)
+            onset = non_tones[:ncidx]
+            coda = non_tones[ncidx + 1:]
 
-            self.structure = (onset, nucleus, coda)
-            return self.structure
+        return (onset, nucleus, coda)
 
     def get_onset(self):
         return self.get_structure()[0]
@@ -234,6 +474,9 @@ class Syllable(object):
         return not self.is_open()
 
     def has_clusters(self):
+        return self._cached("has_clusters", self._has_clusters)
+
+    def _has_clusters(self):
         if len(self.get_onset()) > 1 and len(self.get_coda()) > 1:
             return ["onset", "coda"]
         elif len(self.get_onset()) > 1 and len(self.get_coda()) < 1:
@@ -244,6 +487,9 @@ class Syllable(object):
             return []
 
     def get_clusters(self):
+        return self._cached("clusters", self._get_clusters)
+
+    def _get_clusters(self):
         clusdict = {}
         if len(self.get_onset()) > 1:
             clusdict["onset"] = self.get_onset()
@@ -267,7 +513,30 @@ class Syllable(object):
             raise ValueError(
                 "Syllable {} contains no polyphthong".format(self))
 
+    def get_weight(self):
+        """
+        Returns the weight of the syllable in morae: one for every phoneme
+        of the nucleus, one more for every long one, and one for every
+        phoneme of the coda.
+        """
+        return self._cached("weight", self._get_weight)
+
+    def _get_weight(self):
+        onset, nucleus, coda = self.get_structure()
+        weight = len(nucleus) + len(coda)
+        for ph in nucleus:
+            if (ph.feature_model.is_good_feature("long")
+                    and ph.feature_is_true("long")):
+                weight += 1
+        return weight
+
+    def is_heavy(self):
+        return self.get_weight() > 1
+
     def get_pattern(self):
+        return self._cached("pattern", self._get_pattern)
+
+    def _get_pattern(self):
         ptn = []
         onset, nucleus, coda = self.get_structure()
         for c in onset:
@@ -285,8 +554,34 @@ class Syllable(object):
         return "".join(ptn)
 
 
+def rebuild_syllable(syllable: Syllable, phonemes) -> Syllable:
+    """
+    Returns a new syllable with the given phonemes and the stress and tones
+    of `syllable`, for use by sound changes. If the phonemes are those of
+    `syllable`, the new syllable keeps the properties already computed for
+    it, so that they are not recomputed after every change. Tones among the
+    phonemes are added to the tones of `syllable`.
+    """
+    if isinstance(phonemes, Syllable):
+        phonemes = phonemes.phonemes
+    old = syllable.phonemes
+    if len(phonemes) == len(old) and all(
+            p is q for p, q in zip(phonemes, old)):
+        return syllable.thaw()
+    ns = Syllable(phonemes)
+    if syllable.tones:
+        ns.tones = syllable.tones + ns.tones
+    if syllable.is_stressed():
+        ns.set_stressed()
+    return ns
+
+
 class Word(object):
     def __init__(self, syllables):
+        self.frozen = False
+        self.uid = None
+        self._key = None
+        self._signature = None
         self.syllables = syllables
         self.phonemes = [
             phoneme for syl in self.syllables for phoneme in syl.phonemes
@@ -320,6 +615,15 @@ class Word(object):
         for syl in self.syllables:
             yield syl
 
+    @property
+    def tones(self) -> Tuple[Tuple[int, Phoneme], ...]:
+        """
+        The tone tier of the word: a (syllable index, tone) pair for every
+        tone, in order.
+        """
+        return tuple((i, tone) for i, syl in enumerate(self.syllables)
+                     for tone in syl.tones)
+
     def has_stress(self) -> bool:
         return any(map(lambda s: s.is_stressed(), self.syllables))
 
@@ -333,8 +637,138 @@ class Word(object):
         if spos is not None:
             return self.syllables[spos]
 
+    def __getstate__(self):
+        # the cached signature refers to a PhoneTable, which copies and
+        # pickles of the word must not drag along
+        state = self.__dict__.copy()
+        state["_signature"] = None
+        return state
+
     def copy(self):
-        return deepcopy(self)
+        new = deepcopy(self)
+        new.uid = None
+        if new.frozen:
+            for syl in new.syllables:
+                syl.frozen = False
+            new.phonemes = list(new.phonemes)
+            new.frozen = False
+            new._key = None
+        return new
+
+    def key(self) -> Hashable:
+        """
+        Returns a hashable representation of the phonetic form of the word:
+        its syllables, their phones, tones and stress. Phones are keyed by
+        their ids in the process-wide PhoneTable, so phones with the same
+        symbol but of another class or with other features get other keys.
+        Two words with the same key are interchangeable.
+        """
+        if self._key is not None:
+            return self._key
+        key = tuple((syl.stressed, PHONES.ids_of(syl.phonemes),
+                     PHONES.ids_of(syl.tones))
+                    for syl in self.syllables)
+        if self.frozen:
+            self._key = key
+        return key
+
+    def signature(self, table) -> int:
+        """
+        Returns the set of phones in the word as a bitset: bit n is set if
+        the word contains the phone with id n in table, a PhoneTable.
+        Cached on frozen words.
+        """
+        if self._signature is not None and self._signature[0] is table:
+            return self._signature[1]
+        sig = 0
+        for pid in table.ids_of(self.phonemes):
+            sig |= 1 << pid
+        if self.frozen:
+            self._signature = (table, sig)
+        return sig
+
+    def freeze(self):
+        """
+        Makes the word and its syllables immutable, so that it can be shared,
+        e.g. by caches. Returns the word itself.
+        """
+        for syl in self.syllables:
+            syl.freeze()
+        self.phonemes = tuple(self.phonemes)
+        self.frozen = True
+        return self
+
+    def thaw(self):
+        """
+        Returns a modifiable copy of the word. Unlike copy(), this shares the
+        Phone objects of the word, which are never modified in place.
+        """
+        return Word([syl.thaw() for syl in self.syllables])
+
+    def with_tones(self, tones) -> "Word":
+        """
+        Returns a new word with the segments of this one and the given tone
+        tier, a sequence of tuples of tones, one for every syllable.
+        Syllables keep their computed properties.
+        """
+        new_syllables = []
+        for syl, syl_tones in zip(self.syllables, tones):
+            ns = syl.thaw()
+            ns.tones = tuple(syl_tones)
+            new_syllables.append(ns)
+        return Word(new_syllables)
+
+
+class WordTable(object):
+    """
+    An interning table for Words. All words with the same phonetic form
+    (see Word.key) that are interned in the same table are represented by a
+    single frozen Word object. Interned words carry a unique integer id, uid,
+    which downstream caches may use as a key; ids are never reused.
+
+    The table only holds weak references, so a form that is no longer used
+    anywhere is dropped from it.
+    """
+
+    def __init__(self):
+        self._words = weakref.WeakValueDictionary()
+        self._ids = itertools.count()
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        return word.key() in self._words
+
+    def intern(self, word: Word) -> Word:
+        """
+        Returns the canonical Word object for the phonetic form of word.
+        If the form has not been seen yet, word itself becomes canonical,
+        unless it is modifiable, in which case a frozen copy does.
+        """
+        key = word.key()
+        try:
+            return self._words[key]
+        except KeyError:
+            pass
+        if not word.frozen:
+            word = word.thaw().freeze()
+        word.uid = next(self._ids)
+        self._words[key] = word
+        return word
+
+
+WORDS = WordTable()
+
+
+def intern_word(word: Word) -> Word:
+    """
+    Interns a word in the process-wide WordTable.
+    """
+    return WORDS.intern(word)
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
 
 
 class WordFactory(object):
@@ -343,15 +777,62 @@ class WordFactory(object):
     Can be initialized either with a Phonology or a pure Phoneme class.
     In the first case, it will create Phonemes according to the Phonology's
     Phoneme class.
-    Does not use any Phonology-specific features yet.
+    The only Phonology-specific feature used so far is syllabification
+    (see fromlist).
+
+    Words are cached by their raw IPA representation in a least recently used
+    cache holding up to cache_size words (None for no limit, 0 to disable
+    caching). Since cached words are shared, every Word a factory makes is
+    frozen and interned in the process-wide WordTable.
     """
 
-    def __init__(self, phonology=None, phoneme_cls=Phoneme):
+    DEFAULT_CACHE_SIZE = 2**14
+
+    _shared = dict()
+
+    def __init__(self,
+                 phonology=None,
+                 phoneme_cls=Phoneme,
+                 cache_size=DEFAULT_CACHE_SIZE):
         self.phonology = phonology
         if self.phonology:
             self.phoneme_cls = phonology.phoneme_cls
+            self.syllabifier = Syllabifier.from_phonology(phonology)
         else:
             self.phoneme_cls = phoneme_cls
+            self.syllabifier = Syllabifier(phoneme_cls)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._tokeniser = None
+
+    @classmethod
+    def shared(cls, phoneme_cls=Phoneme):
+        """
+        Returns a process-wide WordFactory for phoneme_cls, so that separately
+        loaded lexicons share one word cache.
+        """
+        try:
+            return cls._shared[phoneme_cls]
+        except KeyError:
+            factory = cls(phoneme_cls=phoneme_cls)
+            cls._shared[phoneme_cls] = factory
+            return factory
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns statistics on the word cache, in the same format as
+        functools.lru_cache.
+        """
+        return CacheInfo(self._hits, self._misses, self.cache_size,
+                         len(self._cache))
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
 
     def make_syllable(self, segs):
         proto_syl = []
@@ -369,13 +850,59 @@ class WordFactory(object):
             syl.set_stressed()
         return syl
 
-    def make_word(self, raw_word):
-        # turn ' into .' to allow splitting into syllables
-        # what about ˌ ?
-        raw_word = replace(raw_word, "'", ".", "'")
-        raw_word = replace(raw_word, "ˈ", ".", "ˈ")
-        # raw_syllables = [syl for syl in split(raw_word, ".") if syl]
-        raw_syllables = tokenise_ipa(raw_word)
+    def make_word(self, raw_word, raw_syllables=None) -> Word:
+        """
+        Makes a frozen Word from an IPA string, with syllables separated by
+        "." and stressed syllables marked by a preceding "'" or "ˈ". Repeated
+        strings are served from the word cache. raw_syllables may be passed
+        in if the string has already been tokenised.
+        """
+        key = raw_word if isinstance(raw_word, str) else tuple(raw_word)
+        if self.cache_size != 0:
+            try:
+                word = self._cache[key]
+            except KeyError:
+                pass
+            else:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return word
+
+        self._misses += 1
+        word = intern_word(self._make_word(raw_word, raw_syllables).freeze())
+        if self.cache_size != 0:
+            self._cache[key] = word
+            if self.cache_size is not None and len(
+                    self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return word
+
+    def make_words(self, raw_words: Iterable[str]) -> List[Word]:
+        """
+        Makes Words from many IPA strings at once. Strings not yet in the
+        word cache are tokenised together in a single pass.
+        """
+        raw_words = [
+            rw if isinstance(rw, str) else "".join(rw) for rw in raw_words
+        ]
+        new = [rw for rw in dict.fromkeys(raw_words) if rw not in self._cache]
+        tokenised = dict(zip(new, self.tokeniser.tokenise_many(new)))
+        return [
+            self.make_word(rw, tokenised.get(rw))
+            for rw in raw_words
+        ]
+
+    @property
+    def tokeniser(self):
+        if self._tokeniser is None:
+            self._tokeniser = self.phoneme_cls().feature_model.tokeniser
+        return self._tokeniser
+
+    def _make_word(self, raw_word, raw_syllables=None):
+        if raw_syllables is None:
+            if not isinstance(raw_word, str):
+                raw_word = "".join(raw_word)
+            raw_syllables = self.tokeniser.tokenise_syllables(raw_word)
         syllables = []
         for rs in raw_syllables:
             syl = []
@@ -405,7 +932,10 @@ class WordFactory(object):
         return word
 
     def fromlist(self, seglist):
-        syllabified = syllabify(seglist, sep='.')
+        """
+        Makes a Word from an unsyllabified list of segments (or IPA string).
+        """
+        syllabified = syllabify(seglist, sep='.', syllabifier=self.syllabifier)
         return self.make_word(syllabified)
 
 
@@ -0,0 +1,110 @@
+"""
+Module defining the disk cache of the PyLaut language, which keeps objects
+that are expensive to build, such as the parser, between processes.
+
+Cached objects are pickled into files in the directory named by the
+PYLAUT_CACHE_DIR environment variable, or else in pylaut under the user's
+cache directory ($XDG_CACHE_HOME or ~/.cache). Setting PYLAUT_CACHE_DIR to
+the empty string turns the cache off. The cache is only an optimization:
+entries that cannot be read or written are ignored.
+
+Entries that have not been used for MAX_AGE seconds are removed whenever an
+entry is stored, and so are the least recently used entries while the cache
+takes up more than MAX_SIZE bytes.
+"""
+
+import os
+import pathlib
+import pickle
+import time
+from typing import Optional
+
+MAX_SIZE = 2**28
+MAX_AGE = 30 * 24 * 60 * 60
+
+
+def cache_dir() -> Optional[pathlib.Path]:
+    """
+    Returns the directory of the disk cache, or None if it is turned off.
+    """
+    path = os.environ.get("PYLAUT_CACHE_DIR")
+    if path is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "pylaut")
+    if not path:
+        return None
+    return pathlib.Path(path)
+
+
+def load(name: str):
+    """
+    Returns the object stored in the cache under name, or None if there is
+    none. The entry is marked as used.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return None
+    path = directory / name
+    try:
+        with path.open("rb") as f:
+            obj = pickle.load(f)
+    except Exception:
+        return None
+    try:
+        os.utime(str(path))
+    except OSError:
+        pass
+    return obj
+
+
+def store(name: str, obj) -> None:
+    """
+    Stores an object in the cache under name. The file is written under a
+    temporary name and then renamed, so that other processes never read a
+    partly written entry.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return
+    tmp = directory / "{}.{}.tmp".format(name, os.getpid())
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with tmp.open("wb") as f:
+            pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(str(tmp), str(directory / name))
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return
+    evict(directory)
+
+
+def evict(directory: pathlib.Path) -> None:
+    """
+    Removes the entries of the cache in directory that have not been used
+    for MAX_AGE seconds, then the least recently used ones while the rest
+    take up more than MAX_SIZE bytes. Files being written are left alone.
+    """
+    entries = []
+    try:
+        for entry in os.scandir(str(directory)):
+            if entry.name.endswith(".tmp") or not entry.is_file():
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    oldest = time.time() - MAX_AGE
+    for mtime, size, path in entries:
+        if mtime >= oldest and total <= MAX_SIZE:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
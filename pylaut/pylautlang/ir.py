@@ -0,0 +1,70 @@
+"""
+Module defining the intermediate representation (IR) of PyLautLang programs.
+
+The IR of a program is its parse tree as plain data. Every rule of the
+grammar becomes a Node holding the name of the rule (or of its alias, such
+as simple_unconditional or relative_expr) and a tuple of children, and
+every token a Leaf holding the token type and text: phonemes and features
+as written, library functions by name. IR can therefore be compared,
+hashed, pickled and rewritten, unlike the closures the PyLautLang
+transformer builds from it, which is the backend that makes IR executable
+(see parser.compile_ir).
+"""
+
+import hashlib
+from collections import namedtuple
+from typing import Iterator, List, Union
+
+from lark import Token, Tree
+
+Node = namedtuple("Node", ["rule", "children"])
+Leaf = namedtuple("Leaf", ["type", "value"])
+
+IR = Union[Node, Leaf, None]
+
+
+def lower(tree) -> IR:
+    """
+    Turns a Lark parse tree of a PyLautLang program into IR.
+    """
+    if isinstance(tree, Tree):
+        return Node(tree.data, tuple(lower(c) for c in tree.children))
+    if isinstance(tree, Token):
+        return Leaf(tree.type, str(tree))
+    return tree
+
+
+def to_tree(node: IR):
+    """
+    Turns IR back into a Lark parse tree, for the PyLautLang transformer.
+    """
+    if isinstance(node, Node):
+        return Tree(node.rule, [to_tree(c) for c in node.children])
+    if isinstance(node, Leaf):
+        return Token(node.type, node.value)
+    return node
+
+
+def walk(node: IR) -> Iterator[Node]:
+    """
+    Yields every Node of an IR tree, parents before their children.
+    """
+    if isinstance(node, Node):
+        yield node
+        for c in node.children:
+            yield from walk(c)
+
+
+def library_calls(node: IR) -> List[str]:
+    """
+    Returns the names of the library functions an IR tree calls, in order.
+    """
+    return [n.children[0].value for n in walk(node) if n.rule == "fcall"]
+
+
+def digest(node: IR, *extra) -> str:
+    """
+    Returns a hex digest identifying an IR tree, and any extra plain data
+    such as library versions, across processes.
+    """
+    return hashlib.sha256(repr((node, ) + extra).encode("utf-8")).hexdigest()
@@ -3,7 +3,7 @@ This module defines several functions for use with PyLautLang, both
 internally and externally in the form of user-callable library functions.
 """
 
-from pylaut.change import change, change_functions
+from pylaut.change import change, change_functions, fst
 from pylaut.language.phonology.phone import Phone
 from typing import Any
 
@@ -63,27 +63,22 @@ def make_predicate(parser_entity):
     return predicate
 
 
+def impure(function):
+    """
+    Decorator for library functions whose changes depend on more than the
+    word they are applied to, e.g. on random numbers or outside state.
+    Results of such changes are not memoized.
+    """
+    function.impure = True
+    return function
+
+
 def metathesis(left, right):
     pl = make_predicate(left)
     pr = make_predicate(right)
 
     def exchange(this):
-        current = this.phonemes.index(this.phoneme)
-        sylidx = this.syllable.phonemes.index(this.phoneme)
-        try:
-            next = this.phonemes[current + 1]
-        except IndexError:
-            return
-        this.phonemes[current] = next
-        this.phonemes[current + 1] = this.phoneme
-        this.syllable.phonemes[sylidx] = next
-        try:
-            this.syllable.phonemes[sylidx + 1] = this.phoneme
-        except IndexError:
-            cursyl = this.syllables.index(this.syllable)
-            this.syllables[cursyl + 1].phonemes[0] = this.phoneme
-        this.advance()
-        return next
+        return this.swap()
 
     def defer(this):
         return exchange(this)
@@ -111,9 +106,13 @@ def intervocal_voicing(this):
 def merge(phonemes, target):
     target = target[0]
     phonemes = [p[0] for p in phonemes]
+
+    def in_domain(p):
+        return any(p.is_symbol(b.symbol) for b in phonemes)
+
     return change.Change().do(lambda _: target).to(
-        change.This.forall(Phone)(
-            lambda p: any(p.is_symbol(b.symbol) for b in phonemes)))
+        change.This.forall(Phone)(in_domain)).with_rule(
+            fst.SegmentRule(in_domain, lambda _: target))
 
 
 def epenthesis(this, phoneme):
@@ -124,12 +123,7 @@ def epenthesis(this, phoneme):
 
     def epenthesize(td, p=p, t=phoneme):
         if p(td.phoneme):
-            cur_idx = td.phonemes.index(td.phoneme)
-            syl_idx = td.syllable.phonemes.index(td.phoneme)
-            td.phonemes.insert(cur_idx + 1, t)
-            td.syllable.phonemes.insert(syl_idx + 1, t)
-            td.advance()
-            return td.phoneme
+            td.insert(t)
         return td.phoneme
 
     return change.Change().do(epenthesize).to(change.This.forall(Phone)(p))
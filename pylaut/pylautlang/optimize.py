@@ -0,0 +1,211 @@
+"""
+Module defining optimization passes over the intermediate representation of
+PyLautLang programs (see the ir module). A pass takes the IR of a program
+and returns IR that compiles to changes with the same effect on every word,
+so passes can be switched on and off independently:
+
+drop_trivial removes conditions that always hold, such as a bare _ written
+as the environment of a default case.
+
+order_conditions sorts the conditions of every condition list so that the
+cheapest ones are checked first: relative expressions, which are compiled
+and memoized per phone, before in-expressions, and those before
+if-expressions, which fetch and build word parts.
+
+merge_features makes every relative expression test all the symbols and
+features it requires at one position with a single test (see
+PyLautLang.merged_relative_expr), instead of one test per feature.
+
+empty_domains does not change the program, but reports the changes that
+cannot apply to any word made of the phonemes of a Phonology.
+"""
+
+from collections import OrderedDict, namedtuple
+from typing import Iterable, List
+
+from pylaut.pylautlang import ir
+from pylaut.pylautlang.ir import Leaf, Node
+
+_TRIVIAL = Node("relative_expr", (Leaf("RELATIVE", "_"), ))
+
+# the cost of checking a condition, by the rule of its expression
+_COSTS = {
+    "relative_expr": 0,
+    "merged_relative_expr": 0,
+    "inexpr": 1,
+    "ifexpr": 2,
+}
+
+
+def _rewrite(node: ir.IR, f) -> ir.IR:
+    """
+    Rebuilds an IR tree bottom-up, replacing every Node by f(node).
+    """
+    if not isinstance(node, Node):
+        return node
+    return f(Node(node.rule, tuple(_rewrite(c, f) for c in node.children)))
+
+
+def _is_trivial(condition: Node) -> bool:
+    body = condition.children[0]
+    if body.rule != "positive_condition":
+        return False
+    expr = body.children[0]
+    return expr._replace(rule="relative_expr") == _TRIVIAL
+
+
+def drop_trivial(program: ir.IR) -> ir.IR:
+    """
+    Removes the conditions that always hold. An and-condition that always
+    holds can be left out, and so can all the or-conditions of a list if one
+    of them always holds. A conditional change left without conditions
+    becomes unconditional; the branches of a conditional chain keep at least
+    one condition, as the grammar requires.
+    """
+
+    def f(node):
+        if node.rule == "condition_list":
+            conditions = node.children
+            if any(c.rule == "or_condition" and _is_trivial(c)
+                   for c in conditions):
+                conditions = [c for c in conditions
+                              if c.rule == "and_condition"]
+            conditions = [c for c in conditions if not _is_trivial(c)]
+            if not conditions:
+                conditions = [next(c for c in node.children
+                                   if _is_trivial(c))]
+            return node._replace(children=tuple(conditions))
+        if node.rule == "basic_conditional":
+            conditions = node.children[1].children
+            if len(conditions) == 1 and _is_trivial(conditions[0]):
+                return node.children[0]
+        return node
+
+    return _rewrite(program, f)
+
+
+def _cost(condition: Node) -> int:
+    return _COSTS.get(condition.children[0].children[0].rule, 3)
+
+
+def order_conditions(program: ir.IR) -> ir.IR:
+    """
+    Sorts the conditions of every condition list by how expensive they are
+    to check. The sort is stable, and and-conditions and or-conditions are
+    only grouped by kind when compiled, so the result is the same.
+    """
+
+    def f(node):
+        if node.rule == "condition_list":
+            return node._replace(children=tuple(
+                sorted(node.children, key=_cost)))
+        return node
+
+    return _rewrite(program, f)
+
+
+def merge_features(program: ir.IR) -> ir.IR:
+    """
+    Makes every relative expression test each of its positions at once.
+    """
+
+    def f(node):
+        if node.rule == "relative_expr":
+            return node._replace(rule="merged_relative_expr")
+        return node
+
+    return _rewrite(program, f)
+
+
+# All passes, in the order they are run.
+PASSES = OrderedDict([
+    ("drop_trivial", drop_trivial),
+    ("order_conditions", order_conditions),
+    ("merge_features", merge_features),
+])
+
+
+def optimize(program: ir.IR, passes: Iterable[str] = PASSES) -> ir.IR:
+    """
+    Runs the named passes over the IR of a program, in the order of PASSES,
+    and returns the optimized IR.
+    """
+    passes = set(passes)
+    unknown = passes - set(PASSES)
+    if unknown:
+        raise ValueError("Unknown optimization passes: {}".format(
+            ", ".join(sorted(unknown))))
+    for name, run in PASSES.items():
+        if name in passes:
+            program = run(program)
+    return program
+
+
+EmptyDomain = namedtuple("EmptyDomain", ["law", "index", "change"])
+
+# the rules of changes, and whether their domain is a list of alternatives
+_CHANGES = {
+    "simple_unconditional": False,
+    "multiple_unconditional": True,
+    "change_feature": False,
+    "replace_by_feature": False,
+    "simple_conditional": False,
+    "multiple_conditional": True,
+    "change_feature_conditional": False,
+    "replace_by_feature_conditional": False,
+}
+
+
+def _laws(node: Node):
+    """
+    Yields the law nodes of a program, including those in groups.
+    """
+    for child in node.children:
+        if child.rule == "law":
+            yield child
+        elif child.rule == "group":
+            yield from _laws(child.children[-1])
+
+
+def _name(law: Node):
+    for meta in law.children[:-1]:
+        if meta.children[0].value.lower() == "name":
+            return meta.children[1].value.strip('"')
+    return None
+
+
+def empty_domains(program: ir.Node, phonology) -> List[EmptyDomain]:
+    """
+    Returns the changes of a program whose domain contains no phoneme, or
+    sequence of phonemes, of a Phonology, so that they cannot apply to any
+    word of a language with that phonology. Every change is reported with
+    the name of its law (None if it has none) and its position in the law.
+    Changes made by library functions are never reported.
+    """
+    from pylaut.pylautlang import parser
+
+    inventory = phonology.phonemes
+    symbols = {p.symbol for p in inventory}
+    pll = parser.PyLautLang()
+
+    def is_empty(domain):
+        value = pll.transform(ir.to_tree(domain))
+        if isinstance(value, dict):
+            return not any(
+                all(p.feature_is(k, v) for k, v in value.items())
+                for p in inventory)
+        return any(p.symbol not in symbols for p in value)
+
+    report = []
+    for law in _laws(program):
+        for index, change in enumerate(law.children[-1].children):
+            if change.rule == "basic_conditional":
+                change = change.children[0]
+            if change.rule not in _CHANGES:
+                continue
+            domain = change.children[0]
+            alternatives = (domain.children
+                            if _CHANGES[change.rule] else [domain])
+            if all(is_empty(d) for d in alternatives):
+                report.append(EmptyDomain(_name(law), index, change))
+    return report
@@ -6,17 +6,23 @@ language.
 
 import functools as ft
 import pathlib
+import re
+from collections import OrderedDict
 from pkgutil import get_data
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import (Callable, Dict, Iterable, List, Optional, Tuple,
+                    Union)
 
-from lark import Lark, ParseError, Transformer
+import lark
+from lark import Lark, ParseError, Token, Transformer
+from lark.exceptions import LarkError
 
-from pylaut.change import change_functions
-from pylaut.change.change import Change, ChangeGroup, This, Transducer
+from pylaut.change import change_functions, fst
+from pylaut.change.change import TIERS, Change, ChangeGroup, This, Transducer
 from pylaut.change.soundlaw import SoundLaw, SoundLawGroup
 from pylaut.language.phonology.phone import Phone
 from pylaut.language.phonology.phonology import Phoneme
 from pylaut.language.phonology.word import Syllable
+from pylaut.pylautlang import cache, ir, optimize
 from pylaut.pylautlang.lib import get_library, make_predicate
 
 Features = Dict[str, str]
@@ -25,47 +31,112 @@ PyLautAtom = Union[Phoneme, PhonemeList, Features]
 Library = Dict[str, Callable[[PyLautAtom], PyLautAtom]]
 
 
-def get_parser():
+class ChangeMarker(object):
     """
-    A convenience function to create a Lark parser for the PyLaut language
-    and return it. The grammar for the PyLaut language is loaded from the
-    package data.
+    The postlexer of the LALR grammar of the PyLaut language (see
+    data/pylautlang_lalr.g). Strips the slashes from phonemes, marks the
+    names of features as WORDs, and puts a _CHANGE token before every
+    change, which it finds by looking ahead for the arrow after the domain.
+    """
+    always_accept = ()
+
+    @staticmethod
+    def _after(tokens, i):
+        """
+        Returns the index of the first token after the value or library
+        function name starting at token i.
+        """
+        if i >= len(tokens):
+            return i
+        close = {"{": "}", "[": "]"}.get(tokens[i].value)
+        if close is None:
+            return i + 1
+        j = i
+        while j < len(tokens) and tokens[j].value != close:
+            j += 1
+        return j + 1
+
+    def _follows(self, tokens, i):
+        j = self._after(tokens, i)
+        return tokens[j].value if j < len(tokens) else None
+
+    def process(self, stream):
+        tokens = list(stream)
+        # whether we are in the branches of a conditional change, where
+        # values followed by => do not start a change
+        in_chain = False
+        brackets = 0
+        for i, tok in enumerate(tokens):
+            if (tok.type in ("PHONEME", "IDENTIFIER")
+                    or tok.value in ("{", "[")):
+                following = self._follows(tokens, i)
+                starts = (following == "(" and tok.type == "IDENTIFIER"
+                          or following == "->"
+                          or following == "=>" and not in_chain)
+                if starts and not brackets:
+                    in_chain = following == "=>"
+                    yield Token.new_borrow_pos("_CHANGE", "", tok)
+            elif tok.value == "=>" and in_chain:
+                # the default branch has no conditions
+                in_chain = self._follows(tokens, i + 1) in ("&", "|")
+
+            if tok.value == "[":
+                brackets += 1
+            elif tok.value == "]":
+                brackets -= 1
+
+            if tok.type == "PHONEME":
+                yield Token("PHONEME_STR", tok.value[1:-1],
+                            tok.pos_in_stream + 1, tok.line, tok.column + 1)
+            elif tok.type == "IDENTIFIER" and brackets:
+                yield Token.new_borrow_pos("WORD", tok.value, tok)
+            else:
+                yield tok
+
 
+@ft.lru_cache(maxsize=None)
+def get_parser(parser: str = "lalr"):
+    """
+    A convenience function to get a Lark parser for the PyLaut language.
+    By default this is an LALR(1) parser for the grammar in
+    data/pylautlang_lalr.g. With parser="earley", it is an Earley parser
+    for the reference grammar in data/pylautlang.g, which gives the same
+    parse trees but is slower. Parsers are built only once per process and
+    then shared.
+
+    :param str parser: "lalr" or "earley".
     :returns: A Lark parser.
     """
-    pllg = Lark(
-        get_data("pylaut", "data/pylautlang.g").decode("utf-8"),
+    if parser == "earley":
+        return Lark(
+            get_data("pylaut", "data/pylautlang.g").decode("utf-8"),
+            propagate_positions=True)
+    if parser != "lalr":
+        raise ValueError("Unknown parser {}".format(parser))
+    return Lark(
+        get_data("pylaut", "data/pylautlang_lalr.g").decode("utf-8"),
+        parser="lalr",
+        lexer="standard",
+        postlex=ChangeMarker(),
         propagate_positions=True)
-    return pllg
 
 
 def phoneme_list_from_string(s: str) -> List[Phoneme]:
     """
-    An ad-hoc tokenizing function that creates a list of Phonemes from
-    an IPA string. Returns a tuple of Phoneme objects; the zero Phoneme
-    returns an empty tuple, a single phoneme a singleton, and so on.
+    A tokenizing function that creates a list of Phonemes from an IPA
+    string, using the tokeniser of the default feature set. Returns a tuple
+    of Phoneme objects; the zero Phoneme returns an empty tuple, a single
+    phoneme a singleton, and so on.
 
     :param str s: An IPA string representing one or more phonemes.
     :returns: A tuple of zero or more Phoneme objects.
     """
-    p = Phoneme()
     ret = []
-    curr = []
-    for ch in s:
-        if curr == []:
-            curr.append(ch)
-        elif ch in p.feature_model._ipa_diacritics:
-            curr.append(ch)
-        else:
-            try:
-                ret.append(Phoneme(curr))
-            except KeyError:
-                pass
-            curr = [ch]
-    try:
-        ret.append(Phoneme(curr))
-    except KeyError:
-        pass
+    for seg in Phoneme().feature_model.tokeniser.tokenise(s):
+        try:
+            ret.append(Phoneme(seg))
+        except KeyError:
+            pass
     return tuple(ret)
 
 
@@ -80,7 +151,8 @@ def flatten(lst: List[List[object]]) -> List[object]:
 
 def compile(scstring: str,
             lib: Library = get_library(),
-            featureset: Optional[str] = None) -> List[SoundLaw]:
+            featureset: Optional[str] = None,
+            passes: Iterable[str] = ()) -> List[SoundLaw]:
     """
     A convenience function that parses a sound change string,
     transforms it into a list of SoundLaw objects and returns the list.
@@ -91,16 +163,50 @@ def compile(scstring: str,
                      object dictionary.
     :param FeatureSet featureset: A featureset object to use instead of the
                                   default one.
+    :param passes: The names of the optimization passes to run over the
+                   program, see the optimize module. None are run by
+                   default.
     :returns: A list of Sound Law objects.
     """
     pll = PyLautLang(lib, featureset)
-    change = pll.compile(scstring)
+    change = pll.compile(scstring, passes)
     return change
 
 
+def lower(scstring: str) -> ir.Node:
+    """
+    Parses a PyLaut language program into its intermediate representation
+    (see the ir module), without compiling it.
+
+    :param str scstring: A PyLaut language program.
+    :returns: The IR of the program.
+    """
+    return ir.lower(get_parser().parse(scstring))
+
+
+def compile_ir(program: ir.Node,
+               lib: Library = get_library(),
+               featureset: Optional[str] = None) -> List[SoundLaw]:
+    """
+    Compiles the intermediate representation of a PyLaut language program,
+    as made by lower, into a list of SoundLaw objects.
+
+    :param program: The IR of a PyLaut language program.
+    :param dict lib: The sound change function library to use for this
+                     compilation, in the form of a function name to function
+                     object dictionary.
+    :param FeatureSet featureset: A featureset object to use instead of the
+                                  default one.
+    :returns: A list of Sound Law objects.
+    """
+    pll = PyLautLang(lib, featureset)
+    return pll.compile_ir(program)
+
+
 def compile_one(scstring: str,
                 lib: Library = get_library(),
-                featureset: Optional[str] = None) -> SoundLaw:
+                featureset: Optional[str] = None,
+                passes: Iterable[str] = ()) -> SoundLaw:
     """
     This function acts like compile, but instead of outputting a list
     of sound laws, will output only one SoundLaw object. Convenient
@@ -112,16 +218,21 @@ def compile_one(scstring: str,
                      object dictionary.
     :param FeatureSet featureset: A featureset object to use instead of the
                                   default one.
+    :param passes: The names of the optimization passes to run over the
+                   program, see the optimize module. None are run by
+                   default.
     :returns: A Sound Law object.
     """
     pll = PyLautLang(lib, featureset)
-    change = pll.compile(scstring)
+    change = pll.compile(scstring, passes)
     return change[0]
 
 
 def parse_file(file_path: str,
                lib: Library = get_library(),
-               featureset: Optional[str] = None) -> List[SoundLaw]:
+               featureset: Optional[str] = None,
+               passes: Iterable[str] = (),
+               cached: bool = True) -> List[SoundLaw]:
     """
     Function that loads a PyLaut language program from disk,
     then compiles it into a list of sound changes.
@@ -132,12 +243,201 @@ def parse_file(file_path: str,
                      object dictionary.
     :param FeatureSet featureset: A featureset object to use instead of the
                                   default one.
+    :param passes: The names of the optimization passes to run over the
+                   program, see the optimize module. None are run by
+                   default.
+    :param bool cached: Whether to take the compiled program from the
+                        cache of compile_cached, and keep it there.
     :returns: A list of Sound Law objects.
     """
     p = pathlib.Path(file_path)
     with p.open('r') as scf:
         scstr = scf.read()
-    return compile(scstr, lib, featureset)
+    if cached:
+        return compile_cached(scstr, lib, featureset, passes)
+    return compile(scstr, lib, featureset, passes)
+
+
+def program_key(scstring: str,
+                lib: Library = get_library(),
+                featureset: Optional[str] = None,
+                passes: Iterable[str] = ()) -> str:
+    """
+    Returns the key under which compile_cached keeps a compiled program: a
+    hex digest of the program text, the grammar and the version of Lark,
+    the name and version of the library, the feature set of phonemes, the
+    feature set the program is compiled with and the optimization passes.
+
+    :param str scstring: A PyLaut language program.
+    :param dict lib: The sound change function library.
+    :param FeatureSet featureset: The feature set passed to compile, if
+                                  any. Feature models are identified by
+                                  their digest.
+    :param passes: The names of the optimization passes.
+    :returns: A hex digest.
+    """
+    lib = lib or {}
+    featureset = getattr(featureset, "digest", None) or featureset
+    return ir.digest(scstring, _compiler_digest(), lib.get("__name__"),
+                     lib.get("__version__"), featureset,
+                     tuple(sorted(passes)))
+
+
+@ft.lru_cache(maxsize=None)
+def _compiler_digest() -> str:
+    """
+    Returns a hex digest of the grammar, the version of Lark and the
+    feature set of phonemes, which do not change while PyLaut runs.
+    """
+    return ir.digest(get_data("pylaut", "data/pylautlang_lalr.g"),
+                     lark.__version__, Phoneme().feature_model.digest)
+
+
+# compiled programs by program_key, see compile_cached
+_PROGRAMS = OrderedDict()
+PROGRAM_CACHE_SIZE = 2**6
+
+
+def compile_cached(scstring: str,
+                   lib: Library = get_library(),
+                   featureset: Optional[str] = None,
+                   passes: Iterable[str] = ()) -> List[SoundLaw]:
+    """
+    Works like compile, but keeps the compiled program under its
+    program_key, in memory and in the disk cache (see the cache module).
+    Compiling the same program again, in this process or a later one, takes
+    it from the cache. Sound laws loaded from disk are rebuilt from their IR
+    (see SoundLaw.__setstate__), which skips parsing the program. The least
+    recently used of more than PROGRAM_CACHE_SIZE programs are forgotten in
+    memory.
+
+    :param str scstring: A PyLaut language program.
+    :param dict lib: The sound change function library to use for this
+                     compilation, in the form of a function name to function
+                     object dictionary.
+    :param FeatureSet featureset: A featureset object to use instead of the
+                                  default one.
+    :param passes: The names of the optimization passes to run over the
+                   program, see the optimize module.
+    :returns: A list of Sound Law objects.
+    """
+    key = program_key(scstring, lib, featureset, passes)
+    try:
+        laws = _PROGRAMS[key]
+    except KeyError:
+        pass
+    else:
+        _PROGRAMS.move_to_end(key)
+        return list(laws)
+    name = "program-{}".format(key)
+    laws = cache.load(name)
+    if laws is None:
+        laws = compile_incremental(scstring, lib, featureset, passes)
+        cache.store(name, laws)
+    _PROGRAMS[key] = laws
+    if len(_PROGRAMS) > PROGRAM_CACHE_SIZE:
+        _PROGRAMS.popitem(last=False)
+    return list(laws)
+
+
+# what split_program looks for: comments, strings and phonemes are
+# matched so that the keywords in them are skipped
+_SPLIT = re.compile(r'%[^\n]*|"(?:\\.|[^"\\])*"|/[^/\\_\n\t\[\]]+/'
+                    r'|\b(CHANGE|change|GROUP|group|BEGIN|begin|END|end)\b')
+_GAP = re.compile(r'(?:\s+|%[^\n]*)*')
+
+
+def split_program(scstring: str) -> Optional[List[str]]:
+    """
+    Splits a PyLaut language program into the text of its top-level laws
+    and groups, each from its CHANGE or GROUP to the matching END, by
+    looking only at those keywords. Returns None if there is anything but
+    whitespace and comments between them, or the keywords do not match up,
+    in which case the program is not valid either.
+
+    :param str scstring: A PyLaut language program.
+    :returns: A list of strings, or None.
+    """
+    blocks = []
+    depth = 0
+    start = None
+    end = 0
+    for m in _SPLIT.finditer(scstring):
+        keyword = m.group(1)
+        if keyword is None:
+            continue
+        keyword = keyword.lower()
+        if keyword in ("change", "group"):
+            if start is None:
+                if not _GAP.fullmatch(scstring, end, m.start()):
+                    return None
+                start = m.start()
+        elif start is None:
+            return None
+        elif keyword == "begin":
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+            if depth == 0:
+                end = m.end()
+                blocks.append(scstring[start:end])
+                start = None
+        else:
+            return None
+    if start is not None or not _GAP.fullmatch(scstring, end):
+        return None
+    return blocks
+
+
+# compiled laws and groups by program_key, see compile_incremental
+_BLOCKS = OrderedDict()
+BLOCK_CACHE_SIZE = 2**12
+
+
+def compile_incremental(scstring: str,
+                        lib: Library = get_library(),
+                        featureset: Optional[str] = None,
+                        passes: Iterable[str] = ()) -> List[SoundLaw]:
+    """
+    Works like compile, but compiles every top-level law and group of the
+    program on its own (see split_program) and keeps it in memory under the
+    program_key of its text. When a program is edited and compiled again,
+    only the laws and groups whose text changed are parsed and compiled;
+    the others are the same SoundLaw objects as before. The least recently
+    used of more than BLOCK_CACHE_SIZE laws and groups are forgotten.
+
+    :param str scstring: A PyLaut language program.
+    :param dict lib: The sound change function library to use for this
+                     compilation, in the form of a function name to function
+                     object dictionary.
+    :param FeatureSet featureset: A featureset object to use instead of the
+                                  default one.
+    :param passes: The names of the optimization passes to run over the
+                   program, see the optimize module.
+    :returns: A list of Sound Law objects.
+    """
+    blocks = split_program(scstring)
+    if blocks is None:
+        # compiling the whole program reports the error where it is
+        return compile(scstring, lib, featureset, passes)
+
+    laws = []
+    for block in blocks:
+        key = program_key(block, lib, featureset, passes)
+        try:
+            law = _BLOCKS[key]
+        except KeyError:
+            try:
+                law = compile(block, lib, featureset, passes)[0]
+            except LarkError:
+                return compile(scstring, lib, featureset, passes)
+            _BLOCKS[key] = law
+            if len(_BLOCKS) > BLOCK_CACHE_SIZE:
+                _BLOCKS.popitem(last=False)
+        else:
+            _BLOCKS.move_to_end(key)
+        laws.append(law)
+    return laws
 
 
 def validate(scstring: str) -> bool:
@@ -154,6 +454,18 @@ def validate(scstring: str) -> bool:
     return True
 
 
+def _attach_ir(law: SoundLaw, node: ir.Node) -> None:
+    """
+    Stores the IR node of a sound law or group, and those of the laws of a
+    group, on the objects compiled from them.
+    """
+    law.ir = node
+    if isinstance(law, SoundLawGroup):
+        block = node.children[-1]
+        for child, child_node in zip(law.children, block.children):
+            _attach_ir(child, child_node)
+
+
 class PyLautLang(Transformer):
     """
     This class defines the methods that turn a Lark-generated PyLaut language
@@ -167,18 +479,39 @@ class PyLautLang(Transformer):
         self.featureset = featureset
         self.parser = get_parser()
 
-    def compile(self, scstring: str) -> List[SoundLaw]:
+    def compile(self, scstring: str,
+                passes: Iterable[str] = ()) -> List[SoundLaw]:
         """
         Convenience method that unifies the steps of parsing and transforming
         inside a single method. Delegated to by all of the module-level
         compile functions.
 
         :param str scstring: A PyLaut language program.
+        :param passes: The names of the optimization passes to run over the
+                       program, see the optimize module.
         :returns: A list of SoundLaw objects.
         """
         t = self.parser.parse(scstring)
-        change = self.transform(t)
-        return change
+        laws = self.compile_ir(optimize.optimize(ir.lower(t), passes))
+        for law, child in zip(laws, t.children):
+            law.source = scstring[child.meta.start_pos:child.meta.end_pos]
+            if not isinstance(law, SoundLawGroup):
+                law.code = law.source
+        return laws
+
+    def compile_ir(self, program: ir.Node) -> List[SoundLaw]:
+        """
+        Turns the intermediate representation of a PyLaut language program
+        into a list of SoundLaw objects. This is the backend of compile; every
+        sound law keeps its IR, so that it can be pickled and recompiled.
+
+        :param program: The IR of a PyLaut language program.
+        :returns: A list of SoundLaw objects.
+        """
+        laws = self.transform(ir.to_tree(program))
+        for law, node in zip(laws, program.children):
+            _attach_ir(law, node)
+        return laws
 
     def start(self, l: List[SoundLaw]) -> List[SoundLaw]:
         """
@@ -395,7 +728,10 @@ class PyLautLang(Transformer):
             return True
 
         ch = ch.to(This.forall(Phone)(match_features))
-        return ch
+        return ch.with_rule(
+            fst.SegmentRule(
+                match_features, lambda p, cd=codomain: change_functions.
+                change_features_map(p, cd)))
 
     def replace_by_feature(
             self, args: List[Union[Features, Tuple[Phoneme]]]) -> Change:
@@ -422,7 +758,8 @@ class PyLautLang(Transformer):
 
         ch = Change().do(lambda p: codomain).to(
             This.forall(Phone)(match_features))
-        return ch
+        return ch.with_rule(fst.SegmentRule(match_features,
+                                            lambda p: codomain))
 
     def positive_condition(self, args: List[Callable[[Transducer], bool]]):
         """
@@ -442,7 +779,13 @@ class PyLautLang(Transformer):
         :param list args: A list with one element, a predicate.
         :returns: A predicate.
         """
-        return lambda td: not args[0](td)
+        def negated(td, condition=args[0]):
+            return not condition(td)
+
+        environment = fst.environment_of(args[0])
+        if environment is not None:
+            negated.environment = fst.Not(environment)
+        return negated
 
     def and_condition(self, args):
         """
@@ -507,6 +850,13 @@ class PyLautLang(Transformer):
 
             return run_ac() and run_oc()
 
+        ands = [fst.environment_of(c) for c in and_conditions]
+        ors = [fst.environment_of(c) for c in or_conditions]
+        if all(e is not None for e in ands + ors):
+            if ors:
+                ands.append(fst.AnyOf(ors))
+            predicate.environment = fst.AllOf(ands)
+
         return predicate
 
     def basic_conditional(self, args):
@@ -636,10 +986,79 @@ class PyLautLang(Transformer):
         :param list args: The list of position parameters.
         :returns: A predicate function on a transducer.
         """
+        tests, anchors = self._relative_tests(args)
+        conditions = []
+        # the same conditions, for compiling the expression; see fst
+        compiled = []
+        for pos, preds in tests:
+            for pred in preds:
+                cls = fst.PhoneClass(pred)
+                conditions.append(This.at(Phone, pos, cls.pred))
+                compiled.append((pos, cls))
+        # the word boundary is checked where the current phoneme is written
+        before = sum(len(preds) for pos, preds in tests if pos < 0)
+        conditions[before:before] = [
+            This.is_at_index(Phone, a) for a in anchors
+        ]
+
+        def run_conditions(td, c=conditions):
+            """
+            Function that closes over the condition list
+            from the relative expression translation.
+            """
+            for f in c:
+                if not f(td):
+                    return False
+            return True
+
+        run_conditions.environment = fst.Environment(compiled, anchors)
+        return run_conditions
+
+    def merged_relative_expr(self, args):
+        """
+        Translates relative position expressions rewritten by the
+        merge_features optimization pass (see the optimize module). These
+        make the same tests as relative_expr, but all the tests at one
+        position are made by a single PhoneClass, so that a phone is tested
+        against a whole feature bundle at once and the result memoized, and
+        the word boundary check, which is cheapest, comes first.
+
+        :param list args: The list of position parameters.
+        :returns: A predicate function on a transducer.
+        """
+        tests, anchors = self._relative_tests(args)
+        conditions = [This.is_at_index(Phone, a) for a in anchors]
+        compiled = []
+        for pos, preds in tests:
+            if len(preds) == 1:
+                cls = fst.PhoneClass(preds[0])
+            else:
+                cls = fst.PhoneClass(
+                    lambda q, ps=tuple(preds): all(f(q) for f in ps))
+            conditions.append(This.at(Phone, pos, cls.pred))
+            compiled.append((pos, cls))
+
+        def run_conditions(td, c=conditions):
+            for f in c:
+                if not f(td):
+                    return False
+            return True
+
+        run_conditions.environment = fst.Environment(compiled, anchors)
+        return run_conditions
+
+    def _relative_tests(self, args):
+        """
+        Reads the arguments of a relative expression. Returns the tests it
+        makes as (offset, predicates) pairs, with one predicate on a phone
+        for every symbol or feature at that offset, and the word positions
+        the current phoneme must be at.
+        """
         # First, check if there are word boundaries specified
         # If yes, check if they are in a legal position.
         # If still yes, set a flag.
-        conditions = []
+        tests = []
+        anchors = []
         wordbreak = None
         if "#" in args:
             if args[0] == "#":
@@ -670,45 +1089,25 @@ class PyLautLang(Transformer):
                 if arg == "_":
                     if wordbreak:
                         if wordbreak > 0:
-                            conditions.append(This.is_at_index(Phone, i))
+                            anchors.append(i)
                         else:
-                            relpos = -(len(args) - i)
-                            conditions.append(This.is_at_index(Phone, relpos))
+                            anchors.append(-(len(args) - i))
                 # Otherwise, assume the string is a phone written without
                 # slashes.
                 else:
-                    for p in arg:
-                        conditions.append(
-                            This.at(Phone, pos, lambda q, p=p: q.is_symbol(p)))
+                    tests.append((pos, [lambda q, p=p: q.is_symbol(p)
+                                        for p in arg]))
             elif isinstance(arg, dict):
                 # If the argument is a dictionary, we have a feature expression
                 # Match the features according to the expression
-                for k, v in arg.items():
-                    conditions.append(
-                        This.at(
-                            Phone,
-                            pos, lambda p, k=k, v=v: p.feature_is(k, v)))
+                tests.append((pos, [lambda p, k=k, v=v: p.feature_is(k, v)
+                                    for k, v in arg.items()]))
             else:
                 # The argument is a Phone
                 # Perform by-symbol matching
                 s = arg.symbol
-                conditions.append(
-                    This.at(Phone, pos, lambda q, s=s: q.is_symbol(s)))
-
-        def run_conditions(td, c=conditions):
-            """
-            Function that closes over the condition list
-            from the relative expression translation.
-            """
-            for f in c:
-                try:
-                    if not f(td):
-                        return False
-                except IndexError:
-                    return False
-            return True
-
-        return run_conditions
+                tests.append((pos, [lambda q, s=s: q.is_symbol(s)]))
+        return tests, anchors
 
     def inexpr(self, args):
         """
@@ -776,26 +1175,20 @@ class PyLautLang(Transformer):
         """
         counter = args[0]
         raw_pos = args[1]
+        if counter in TIERS:
+            return self._tier_fetcher(TIERS[counter], raw_pos)
         if isinstance(raw_pos, tuple):
             position = int(raw_pos[1])
             if counter == "Syllable":
 
                 def get_at_syllable_offset(this, p=position):
-                    idx = this.syllables.index(this.syllable)
-                    if idx < 0 or idx >= len(this.syllables):
-                        return None
-                    return this.syllables[this.syllables.index(this.syllable) +
-                                          p]
+                    return this.syllable_at(p)
 
                 return get_at_syllable_offset
             elif counter == "Phone":
 
                 def get_at_phoneme_offset(this, p=position):
-                    idx = this.phonemes.index(this.phoneme)
-                    rel = idx + p
-                    if rel < 0 or rel >= len(this.phonemes):
-                        return Phoneme.empty()
-                    return this.phonemes[this.phonemes.index(this.phoneme) + p]
+                    return this.segment_at(p)
 
                 return get_at_phoneme_offset
         else:
@@ -817,6 +1210,37 @@ class PyLautLang(Transformer):
 
                 return get_at_phoneme_index
 
+    def tier(self, args):
+        """
+        Translates tier index expressions such as [+round][@-1], which
+        fetch a phoneme from the tier of a natural class. Named tiers such
+        as Vowel[@-1] are translated by the index method.
+
+        :param list args: A feature expression and an index or offset.
+        :returns: A fetcher function on a transducer.
+        """
+        return self._tier_fetcher(make_predicate(args[0]), args[1])
+
+    def _tier_fetcher(self, pred, raw_pos):
+        """
+        Returns a fetcher for the phoneme at an offset from the current one
+        along the tier of pred, or at an absolute index on that tier.
+        """
+        if isinstance(raw_pos, tuple):
+
+            def get_at_tier_offset(this, p=int(raw_pos[1])):
+                return this.tier_at(pred, p)
+
+            return get_at_tier_offset
+
+        def get_at_tier_index(this, p=int(raw_pos)):
+            positions = this.tier(pred).positions
+            if p < 0 or p >= len(positions):
+                return None
+            return this.segments[positions[p]]
+
+        return get_at_tier_index
+
     def offset(self, args: int) -> Tuple[str, int]:
         """
         Translates relative index expressions. Basically a tagged integer to
@@ -911,7 +1335,8 @@ class PyLautLang(Transformer):
         Looks up a function name in the function library,
         a dictionary passed to the PyLautLang object at init time.
         If the function exists, call it. If not, return an empty
-        Change.
+        Change. Changes made by functions marked with lib.impure are marked
+        as impure too.
 
         :param list children: A function name plus the arguments to it.
         :returns: A Change object.
@@ -921,9 +1346,13 @@ class PyLautLang(Transformer):
         for c in children[1:]:
             args.append(c)
         try:
-            return self.funcs[fname](*args)
+            function = self.funcs[fname]
         except KeyError:
             return Change()
+        ch = function(*args)
+        if getattr(function, "impure", False):
+            ch = ch.impure()
+        return ch
 
     def eqexpr(self, args: List[Optional[PyLautAtom]]
                ) -> Callable[[Transducer], bool]:
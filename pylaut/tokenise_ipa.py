@@ -1,6 +1,7 @@
 from itertools import tee
-from pkgutil import get_data
-from pylaut import utils
+from pylaut.language.phonology import featureset
+from pylaut.language.phonology import syllabifier as sy
+from pylaut.language.phonology.tokeniser import STRESS_MARKS, SYLLABLE_BREAK
 
 
 def pairwise(iterable):
@@ -13,50 +14,40 @@ def pairwise(iterable):
 def tokenise_ipa(s, feature_set=None):
     """
     Outputs a tuple of tokenised ipa symbols, with diacritics grouped with base
-    glyphs. If the ipa is presented sI'lab.ik.lI, it outputs a tuple of tuples
+    glyphs. If the ipa is presented sI'lab.ik.lI, it outputs a tuple of tuples.
+    Tokenising is done by the compiled tokeniser of feature_set (a
+    FeatureModel), or of the default feature set if none is given.
     """
-    if not feature_set:
-        dia_file = get_data("pylaut", "data/monophone_ipa_diacritics").decode(
-            'utf-8')
-        read_words = [x for x in dia_file.splitlines()]
-        diacritics = [x.split()[0] for x in read_words]
-    else:
-        diacritics = feature_set._feature_set_ipa_diacritics.keys()
-
-    s = utils.replace(s, "'", ".'")
-    sl = utils.split(s, ".")
-
-    tokens = []
-
-    for syllable in sl:
-        syllable_tokens = []
-        # if syllable and syllable[0] == "'":
-        #     stress = "'"
-        #     syl = syllable[1:]
-        # else:
-        #     stress = ""
-        #     syl = syllable
-        syl = syllable
-
-        for i, c in enumerate(syl):
-            if c in diacritics:
-                pass
-            elif i < len(syl)-1 and syl[i+1] in diacritics:
-                syllable_tokens += [c + syl[i+1]]
-            else:
-                syllable_tokens += [c]
-
-        tokens += [syllable_tokens]
-
-        out = [tuple(x) for x in tokens]
-
-        if len(out) == 1:
-            out = out[0]
-
-        out = tuple(t for t in out if t is not ())
-
+    if feature_set is None:
+        feature_set = featureset.get_feature_model("monophone")
+    out = feature_set.tokeniser.tokenise_syllables(s)
+    if len(out) == 1:
+        out = out[0]
     return out
 
 
-def syllabify(seglist: list, sep: str) -> list:
-    pass
+def syllabify(seglist: list, sep: str, syllabifier=None) -> list:
+    """
+    Divides a list of ipa segments into syllables, using sonority sequencing
+    and the maximal onset principle. A string is tokenised first. Syllable
+    breaks and stress marks in the input are ignored. Outputs the segments
+    with sep inserted at every syllable boundary.
+    """
+    if syllabifier is None:
+        syllabifier = _default_syllabifier()
+    if isinstance(seglist, str):
+        tokeniser = syllabifier.phoneme_cls().feature_model.tokeniser
+        seglist = tokeniser.tokenise(seglist)
+    segments = [s for s in seglist
+                if s != SYLLABLE_BREAK and s not in STRESS_MARKS]
+    return syllabifier.syllabify(segments, sep)
+
+
+def _default_syllabifier():
+    global _DEFAULT_SYLLABIFIER
+    if _DEFAULT_SYLLABIFIER is None:
+        _DEFAULT_SYLLABIFIER = sy.Syllabifier()
+    return _DEFAULT_SYLLABIFIER
+
+
+_DEFAULT_SYLLABIFIER = None
@@ -41,11 +41,14 @@ setup(
         'pylaut': [
             'data/monophone', 'data/monophone_ipa',
             'data/monophone_ipa_diacritics', 'data/phoible-segf',
-            'data/phoible-segf_ipa', 'data/pylautlang.g'
+            'data/phoible-segf_ipa', 'data/pylautlang.g',
+            'data/pylautlang_lalr.g'
         ]
     },
 
     # dependencies for the package
     install_requires=['lark-parser', 'plac'],
+    # optional dependencies
+    extras_require={'numpy': ['numpy']},
     # entry points
     entry_points={'console_scripts': ['pylaut = main:main']})
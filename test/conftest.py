@@ -0,0 +1,25 @@
+import pytest
+
+from pylaut.language.phonology.phonology import Phoneme
+
+
+class ToneLetter(Phoneme):
+    """
+    A tone, written with a tone letter. The feature sets have no tones, so
+    the symbol is set directly.
+    """
+
+    def __init__(self, symbol=None):
+        super().__init__()
+        self.symbol = symbol
+
+    def is_tone(self):
+        return True
+
+
+@pytest.fixture
+def tones():
+    """
+    A high and a low tone.
+    """
+    return ToneLetter("˥"), ToneLetter("˩")
@@ -0,0 +1,71 @@
+from pylaut.change.change import Change, ChangeGroup, This, Tier, Transducer
+from pylaut.language.phonology import word
+from pylaut.language.phonology.phone import Phone
+from pylaut.language.phonology.phonology import Phoneme
+from pylaut.language.phonology.word import (SYLLABLE_BOUNDARY,
+                                            WORD_BOUNDARY, Syllable)
+
+
+def test_change_builders_share_structure():
+    base = Change().do(lambda td: Phoneme("e")).to(
+        This.forall(Phone)(lambda p: p.is_symbol("a")))
+    cond = base.when(This.at(Phone, 1, lambda p: p.is_symbol("k")))
+    assert base.conditions == ()
+    assert len(cond.conditions) == 1
+    assert cond.appl is base.appl
+    assert cond.changes is base.changes
+
+    w = word.WordFactory().make_word("pa.ka")
+    assert repr(base.apply(w)) == "/pe.ke/"
+    assert repr(cond.apply(w)) == "/pe.ka/"
+
+
+def test_change_group_merges_conditions():
+    a_to_e = Change().do(lambda td: Phoneme("e")).to(
+        This.forall(Phone)(lambda p: p.is_symbol("a")))
+    group = ChangeGroup([a_to_e])
+    cond = group.when(This.is_at_index(Phone, -1))
+    assert group._merged == (a_to_e, )
+    assert cond._merged[0].conditions == cond.conditions
+
+    w = word.WordFactory().make_word("pa.ka")
+    assert repr(group.apply(w)) == "/pe.ke/"
+    assert repr(cond.apply(w)) == "/pa.ke/"
+
+
+def test_transducer_positions_of_equal_syllables():
+    ch = Change().do(lambda td: [Phoneme("t"), Phoneme("a")]).to(
+        This.forall(Syllable)(lambda s: True)).when(
+            This.at(Syllable, -1, lambda s: True))
+    w = word.WordFactory().make_word("ka.ka.ka")
+    assert repr(ch.apply(w)) == "/ka.ta.ta/"
+
+    final = Change().do(lambda td: Phoneme("o")).to(
+        This.forall(Phone)(lambda p: p.is_symbol("a"))).when(
+            This.is_at_index(Phone, -1))
+    assert repr(final.apply(w)) == "/ka.ka.ko/"
+
+
+def test_transducer_window_is_padded_with_boundaries():
+    w = word.WordFactory().make_word("pa.tak")
+    td = Transducer(w, Change())
+    td.ph_index, td.syl_index, td.syl_ph_index = 1, 0, 1
+    td.syllable = w.syllables[0]
+    window = td.window(2, 2)
+    assert window[0] is WORD_BOUNDARY
+    assert [p.symbol for p in window[1:]] == ["p", "a", "t", "a"]
+    assert td.window(1, 1, syllable=True)[2] is SYLLABLE_BOUNDARY
+    assert td.segment_at(5) is WORD_BOUNDARY
+    assert not WORD_BOUNDARY.feature_is("voice", "+")
+
+
+def test_tier_neighbours():
+    w = word.WordFactory().make_word("pa.tak.si")
+    tier = Tier(w.phonemes, lambda p: p.is_vowel())
+    assert tier.positions == [1, 3, 6]
+    assert tier.neighbour(2, -1) == 1
+    assert tier.neighbour(2, 1) == 3
+    assert tier.neighbour(3, 1) == 6
+    assert tier.neighbour(3, -2) is None
+    assert tier.neighbour(3, 0) == 3
+    assert tier.neighbour(4, 0) is None
@@ -0,0 +1,165 @@
+from pylaut.change import fst
+from pylaut.change.change import ChangeGroup, Transducer
+from pylaut.language.phonology import word
+from pylaut.pylautlang import parser
+
+import pytest
+
+RULES = [
+    "CHANGE BEGIN /a/ -> /e/ END",
+    "CHANGE BEGIN [+sibilant] -> [+voice] END",
+    "CHANGE BEGIN [+sibilant] -> /h/ END",
+    "CHANGE BEGIN /k/ -> /0/ | _# END",
+    "CHANGE BEGIN /a/ -> /e/ | _[+front] END",
+    "CHANGE BEGIN /a/ -> /e/ | !_[+front] END",
+    "CHANGE BEGIN /a/ -> /o/ | #/k/_ | /t/_ END",
+    "CHANGE BEGIN /a/ -> /o/ & /k/_ & _/j/ END",
+    "CHANGE BEGIN [+sibilant] -> [+voice] | [-consonantal]_[-consonantal] END",
+]
+
+WORDS = ["ko'raj.ka", "ma'sa.la", "ka.sa.tak", "'a.ka", "pe'si.ka"]
+
+
+@pytest.mark.parametrize("rule", RULES)
+def test_compiled_rules_match_transducer(rule):
+    wf = word.WordFactory()
+    sc = parser.compile(rule)[0]
+    for ch in sc.changes:
+        assert ch.compiled is not None
+        for raw in WORDS:
+            w = wf.make_word(raw)
+            assert repr(ch.apply(w)) == repr(Transducer(w, ch)())
+
+
+def test_uncompilable_condition_falls_back():
+    wf = word.WordFactory()
+    sc = parser.compile("CHANGE BEGIN /a/ -> /e/ | if Phone[@1] is /j/ END")
+    ch = sc[0].changes[0]
+    assert ch.compiled is None
+    assert repr(ch.apply(wf.make_word("ko'raj.ka"))) == "/ko.'rej.ka/"
+
+
+BLOCK = """
+CHANGE BEGIN
+  /a/ -> /e/ | _[+front]
+  /e/ -> /i/
+  [+sibilant] -> [+voice] | [-consonantal]_[-consonantal]
+  /k/ -> /ɡ/ | /e/_
+  /t/ -> /0/ | _#
+  /o/ => /u/ | _/k/
+      => /ɔ/
+END
+"""
+
+
+def test_fused_block_matches_sequential():
+    wf = word.WordFactory()
+    law = parser.compile(BLOCK)[0]
+    assert any(isinstance(step, fst.FusedRule) for step in law.program)
+    for raw in WORDS + ["ta.ko.sa", "'e.ka.set"]:
+        w = wf.make_word(raw)
+        expected = w
+        for ch in law.changes:
+            expected = Transducer(expected, ch)() if not isinstance(
+                ch, ChangeGroup) else ch.apply(expected)
+        assert repr(law.apply(w)) == repr(expected)
+
+
+def test_independent_rules_are_fused():
+    wf = word.WordFactory()
+    law = parser.compile("""
+    CHANGE BEGIN
+      /p/ -> /f/ | _[-consonantal]
+      /d/ -> /ð/ | [-consonantal]_
+      /ɡ/ -> /ɣ/
+    END
+    """)[0]
+    fused, = law.program
+    assert repr(law.apply(wf.make_word("pa.da.ɡa"))) == "/fa.ða.ɣa/"
+    assert fused.fused_words == 1
+    assert fused.sequential_words == 0
+
+
+def test_words_without_domain_phones_are_skipped():
+    wf = word.WordFactory()
+    law = parser.compile("CHANGE BEGIN /b/ -> /v/ | [-consonantal]_ END")[0]
+    w = wf.make_word("ta.ka")
+    assert w.signature(fst.PHONES) == w.signature(fst.PHONES)
+    assert law.apply(w) is w
+    assert repr(law.apply(wf.make_word("a.ba"))) == "/a.va/"
+    (step, hits, skips), = law.rule_stats()
+    assert (hits, skips) == (1, 1)
+
+
+def test_fused_rules_count_their_own_hits_and_skips():
+    wf = word.WordFactory()
+    law = parser.compile("""
+    CHANGE BEGIN
+      /p/ -> /f/ | _[-consonantal]
+      /f/ -> /h/
+      /ɡ/ -> /ɣ/
+    END
+    """)[0]
+    assert isinstance(law.program[0], fst.FusedRule)
+    for raw in ["pa.ta", "ɡa", "ta"]:
+        law.apply(wf.make_word(raw))
+    assert [(hits, skips) for _, hits, skips in law.rule_stats()] == [
+        (1, 2), (1, 2), (1, 2)
+    ]
+
+
+def test_rewritten_words_are_frozen():
+    wf = word.WordFactory()
+    law = parser.compile("CHANGE BEGIN /p/ -> /f/ END")[0]
+    w = wf.make_word("pa").thaw()
+    new = law.apply(w)
+    assert new.frozen
+    new.signature(fst.PHONES)
+    assert new._signature is not None
+    assert new.copy()._signature is None
+    assert not w.frozen
+
+
+def test_conditional_chain_is_a_decision_list():
+    wf = word.WordFactory()
+    group = parser.compile("""
+    CHANGE BEGIN
+      [+sibilant] => [+voice]    | [-consonantal]_[-consonantal]
+                  => [+front]    | _[-consonantal +front]
+                  => [+sibilant]
+    END
+    """)[0].changes[0]
+    assert isinstance(group.compiled, fst.FusedRule)
+    for raw in ["mak'si.ra", "ma'sa.la", "pe'si.ka", "sa'mo.ŋe"]:
+        w = wf.make_word(raw)
+        expected = w
+        for ch in group._merged:
+            expected = Transducer(expected, ch)()
+        assert repr(group.apply(w)) == repr(expected)
+    assert group.compiled.fused_words == 4
+
+
+def test_sequence_matcher_finds_leftmost_longest_matches():
+    table = fst.PhoneTable()
+    wf = word.WordFactory()
+    matcher = fst.SequenceMatcher([["t", "s"], ["s", "a"], ["t", "s", "a"]],
+                                  table)
+    w = wf.make_word("tsa.sa.tst")
+    assert matcher.matches(table.ids_of(w.phonemes)) == [(0, 2), (3, 1),
+                                                         (5, 0)]
+
+
+@pytest.mark.parametrize("rule", [
+    "CHANGE BEGIN /t s/ -> /c/ END",
+    "CHANGE BEGIN {/t s/, /s a/} -> {/c/, /x/} END",
+])
+def test_sequence_rules_match_contour_path(rule):
+    wf = word.WordFactory()
+    sc = parser.compile(rule)[0]
+    for ch in sc.changes:
+        for c in getattr(ch, "_merged", [ch]):
+            assert isinstance(c.compiled, fst.SequenceRule)
+            for raw in ["at.sa.tsa", "'tsat.sa", "sa.ta.ts"]:
+                w = wf.make_word(raw)
+                assert repr(c.apply(w)) == repr(
+                    c._with(compiled=None).apply(w))
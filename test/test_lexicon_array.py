@@ -0,0 +1,51 @@
+import pytest
+
+from pylaut.language import lexicon_array
+from pylaut.language.lexicon import Lexicon
+from pylaut.pylautlang import parser
+
+np = pytest.importorskip("numpy")
+
+LEXICON = ("'ta.ka\tx\tone\n'te.se\ty\ttwo\n'si.ta\tz\tthree\n"
+           "pa'θo\tw\tfour\n")
+
+
+def test_vectorized_lexicon_matches_per_word_engine():
+    lexicon = Lexicon()
+    lexicon.from_string(LEXICON)
+    changes = parser.compile("""
+    CHANGE BEGIN
+      /θ/ -> /s/
+      [+sibilant] -> [+voice]
+      /e/ -> /0/
+      /a/ -> /o/ | _/k/
+      Merge({/i/, /o/}, /u/)
+    END
+    """)
+    expected = [repr(e) for e in lexicon.run_sound_changes(changes).entries]
+    new = lexicon_array.run_sound_changes(lexicon, changes)
+    assert [repr(e) for e in new.entries] == expected
+
+
+def test_lookup_table_deletes_phones():
+    lexicon = Lexicon()
+    lexicon.from_string(LEXICON)
+    array = lexicon_array.LexiconArray.from_lexicon(lexicon)
+    law, = parser.compile("CHANGE BEGIN /a/ -> /0/ END")
+    rule, = law.program
+    array.apply_lookup_table(array.lookup_table(rule))
+    assert [repr(w) for w in array.to_words()] == [
+        "/'t.k/", "/'te.se/", "/'si.t/", "/p.'θo/"
+    ]
+
+
+def test_tone_tier_survives_round_trip(tones):
+    from pylaut.language.phonology import word
+    from pylaut.language.phonology.phonology import Phoneme
+
+    high, _ = tones
+    w = word.Word([word.Syllable([Phoneme("k"), Phoneme("a"), high]),
+                   word.Syllable([Phoneme("t"), Phoneme("a")])])
+    array = lexicon_array.LexiconArray([w])
+    assert array.tone_ids.tolist() == [array.table.id_of(high)]
+    assert repr(array.to_words()[0]) == "/ka˥.ta/"
@@ -126,3 +126,312 @@ def test_compound_expression_with_word_break_in_relexp(wf):
     new_words = [repr(sc.apply(w)) for w in words]
     assert new_words == ["/ok.to/", "/a.po.lo/", "/te.o.lo/",
                          "/kwen.dre.lo/"]
+
+
+def test_epenthesis_leaves_input_word_intact(wf):
+    sc = parser.compile("CHANGE BEGIN Epenthesis([+consonantal], /a/) | _# END")[0]
+    w = wf.make_word("pa.tak")
+    nw = sc.apply(w)
+    assert repr(nw) == "/pa.taka/"
+    assert repr(w) == "/pa.tak/"
+    assert repr(sc.apply(wf.make_word("pa.tak"))) == "/pa.taka/"
+
+
+def test_metathesis_leaves_input_word_intact(wf):
+    sc = parser.compile(
+        "CHANGE BEGIN Metathesis([+sibilant -voice],[-consonantal]) END")[0]
+    w = wf.make_word("sa.pas.a")
+    assert repr(sc.apply(w)) == "/as.paa.s/"
+    assert repr(w) == "/sa.pas.a/"
+
+
+def test_contour_across_syllables_leaves_input_word_intact(wf):
+    sc = parser.compile("CHANGE BEGIN /t s/ -> /c/ END")[0]
+    w = wf.make_word("at.sa.tsa")
+    assert repr(sc.apply(w)) == "/ac.a.ca/"
+    assert repr(w) == "/at.sa.tsa/"
+
+
+def test_merged_forms_share_one_word():
+    from pylaut.language.lexicon import Lexicon
+    lexicon = Lexicon()
+    lexicon.from_string("'ta.ka\tx\tone\n'ta.ke\ty\ttwo\n")
+    changes = parser.compile("CHANGE BEGIN /e/ -> /a/ END")
+    new = lexicon.run_sound_changes(changes)
+    assert new.entries[0].phonetic is new.entries[1].phonetic
+    assert new.entries[0].phonetic is lexicon.entries[0].phonetic
+
+
+def test_lexicon_segment_index_follows_changes():
+    from pylaut.change import fst
+    from pylaut.language.lexicon import Lexicon
+    lexicon = Lexicon()
+    lexicon.from_string("'ta.ka\tx\tone\n'te.se\ty\ttwo\n'si.ta\tz\tthree\n")
+    changes = parser.compile("""
+    CHANGE BEGIN
+      /s/ -> /z/ | [-consonantal]_
+      /e/ -> /i/
+    END
+    """)
+    new = lexicon.run_sound_changes(changes)
+    assert [repr(e) for e in new.entries] == [
+        repr(e.run_sound_changes(changes)) for e in lexicon.entries
+    ]
+    index = new.segment_index()
+    z = fst.PHONES.id_of(new.entries[1].phonetic.phonemes[2])
+    e = fst.PHONES.id_of(lexicon.entries[1].phonetic.phonemes[1])
+    assert index[z] == {1}
+    assert 1 not in index[e]
+
+
+def test_sound_law_results_are_memoized(wf):
+    from pylaut.change.memo import ApplicationMemo
+    from pylaut.language.lexicon import Lexicon
+    lexicon = Lexicon()
+    lexicon.from_string("'ta.ka\tx\tone\n'ta.ka\ty\ttwo\n'te.se\tz\tthree\n")
+    changes = parser.compile("CHANGE BEGIN /a/ -> /o/ | _[+consonantal] END")
+    memo = ApplicationMemo()
+    new = lexicon.run_sound_changes(changes, memo=memo)
+    assert [repr(e) for e in new.entries] == [
+        "/'to.ka/", "/'to.ka/", "/'te.se/"
+    ]
+    assert (memo.hits, memo.misses) == (1, 1)
+
+    entry = lexicon.entries[0]
+    assert repr(entry.run_sound_changes(changes, memo=memo)) == "/'to.ka/"
+    assert repr(entry.run_sound_changes(changes, memo=memo)) == "/'to.ka/"
+    assert memo.hits == 2
+
+
+def test_impure_library_functions_are_not_memoized(wf):
+    from pylaut.change.change import Change
+    from pylaut.change.memo import ApplicationMemo
+    from pylaut.pylautlang import lib
+
+    calls = []
+
+    @lib.impure
+    def count(*args):
+        def counting(td):
+            calls.append(td.phoneme)
+            return td.phoneme
+        return Change().do(counting).to(lambda td: lambda f, c: td._run_ph(
+            lambda p: True, f, c))
+
+    library = lib.get_library()
+    library["Count"] = count
+    law, = parser.compile("CHANGE BEGIN Count() END", library)
+    assert not law.pure
+    memo = ApplicationMemo()
+    w = wf.make_word("pa.ta")
+    memo.apply(law.uid, law, w)
+    memo.apply(law.uid, law, w)
+    assert len(calls) == 8
+    assert len(memo) == 0
+
+
+def test_tier_conditions(wf):
+    harmony = parser.compile(
+        "CHANGE BEGIN /a/ -> /e/ | if Vowel[@-1] is /i/ END")[0]
+    assert repr(harmony.apply(wf.make_word("pi.tra.sa"))) == "/pi.tre.sa/"
+    rounding = parser.compile(
+        "CHANGE BEGIN /a/ -> /o/ | if [+round][@-1] is /u/ END")[0]
+    assert repr(rounding.apply(wf.make_word("mu.ka.sa"))) == "/mu.ko.so/"
+    first = parser.compile(
+        "CHANGE BEGIN /t/ -> /d/ | if Vowel[0] is /o/ END")[0]
+    assert [repr(first.apply(wf.make_word(w))) for w in ["to.ta", "ta.to"]
+            ] == ["/do.da/", "/ta.to/"]
+
+
+def test_tone_tier_conditions(tones):
+    from pylaut.language.phonology.phonology import Phoneme
+    from pylaut.language.phonology.word import Syllable, Word
+
+    high, low = tones
+    w = Word([
+        Syllable([Phoneme("m"), Phoneme("a"), high]),
+        Syllable([Phoneme("t"), Phoneme("a"), high]),
+        Syllable([Phoneme("k"), Phoneme("a"), low]),
+    ])
+    # a vowel whose tone is that of the preceding syllable
+    plateau = parser.compile(
+        "CHANGE BEGIN /a/ -> /e/ | if Tone[@1] = Tone[@-1] END")[0]
+    assert repr(plateau.apply(w)) == "/ma˥.te˥.ka˩/"
+    last = parser.compile(
+        "CHANGE BEGIN {/t/, /k/} -> {/d/, /ŋ/} | if Tone[2] = Tone[@1] END")[0]
+    assert repr(last.apply(w)) == "/ma˥.ta˥.ŋa˩/"
+
+
+def test_compiled_laws_round_trip_through_pickle(wf):
+    import pickle
+    from pylaut.pylautlang import ir
+    src = ('CHANGE META name "one" BEGIN /a/ -> /e/ | _/k/ END\n'
+           'GROUP BEGIN CHANGE BEGIN [+sibilant] -> [+voice] END END')
+    laws = parser.compile(src)
+    program = parser.lower(src)
+    assert program == parser.lower(src)
+    assert hash(program) == hash(parser.lower(src))
+    assert laws[0].ir == program.children[0]
+    assert laws[0].code == 'CHANGE META name "one" BEGIN /a/ -> /e/ | _/k/ END'
+    assert ir.library_calls(parser.lower("CHANGE BEGIN Lengthen(/a/) END")
+                            ) == ["Lengthen"]
+
+    restored = pickle.loads(pickle.dumps(laws))
+    w = wf.make_word("sak.sa")
+    for law, new in zip(laws, restored):
+        assert new.digest() == law.digest()
+        assert new.uid != law.uid
+        assert repr(new.apply(w)) == repr(law.apply(w))
+
+
+OPTIMIZED = """
+CHANGE META name "lenition" BEGIN
+  /b/ -> /β/ | [-consonantal]_[-consonantal -round] | _
+  /p/ -> /f/ | if Vowel[@-1] is /i/ & _[+syllabic -high] & _
+END
+CHANGE BEGIN
+  /a/ => /e/ | _[+front] & in Syllable[0]
+      => /o/ | #_ | _#
+      => /a/
+  /k/ -> /tʃ/ | _ | _/i/
+  /s/ -> /h/ | !_ & _
+END
+GROUP BEGIN
+  CHANGE BEGIN [+sibilant -voice] -> /z/ | [-consonantal]_ END
+  CHANGE META name "uvulars" BEGIN /q/ -> /k/ END
+END
+"""
+
+
+def test_optimization_passes_preserve_results(wf):
+    import itertools
+    from pylaut.pylautlang import optimize
+    words = [wf.make_word(w) for w in [
+        "pa.ta", "ba.ba", "ki.pa", "si.pe", "ai.sa", "mo.ki", "ka", "pi.bo",
+        "sa.ke.ro", "da.pi.pa"
+    ]]
+
+    def run(laws, w):
+        for law in laws:
+            w = law.apply(w)
+        return repr(w)
+
+    expected = [run(parser.compile(OPTIMIZED), w) for w in words]
+    for n in range(len(optimize.PASSES) + 1):
+        for passes in itertools.combinations(optimize.PASSES, n):
+            laws = parser.compile(OPTIMIZED, passes=passes)
+            assert [run(laws, w) for w in words] == expected
+
+    with pytest.raises(ValueError):
+        parser.compile(OPTIMIZED, passes=["inline"])
+
+
+def test_optimization_passes(wf):
+    from pylaut.language.phonology.phonology import Phonology
+    from pylaut.pylautlang import ir, optimize
+    program = parser.lower(OPTIMIZED)
+    dropped = optimize.drop_trivial(program)
+    rules = [n.rule for n in ir.walk(dropped)]
+    assert rules.count("basic_conditional") == 3
+    assert rules.count("relative_expr") == 6
+
+    ordered = optimize.order_conditions(program)
+    conditions = [n for n in ir.walk(ordered)
+                  if n.rule == "condition_list"][1].children
+    assert [c.children[0].children[0].rule for c in conditions
+            ] == ["relative_expr", "relative_expr", "ifexpr"]
+
+    reported = optimize.empty_domains(
+        program, Phonology(["p", "t", "k", "a", "i", "s", "b"]))
+    assert [(r.law, r.index) for r in reported] == [("uvulars", 0)]
+
+
+def test_lalr_parser_matches_earley_parser():
+    src = """
+    % values after a relative expression may start the next change
+    CHANGE META name "x" BEGIN
+      /a/ -> /e/ | _/s/
+      /s/ -> /z/ | [-consonantal]_
+      {/p/, /t/} -> {/b/, /d/} | _[+voice]
+      [+sibilant] -> [+voice] | _{/a/}
+      Lengthen([-consonantal]) | _/h/
+      /h/ => /aː/ | [+consonantal]_[+consonantal]
+          => /aː/ | [+consonantal]_# & !_/i/
+          => /h/
+      [+round] => /u/ | if Vowel[@-1] is /i/ | in Syllable[0] => /o/
+      /k/ -> /x/ | if [+round][@-1] = [+round]
+      [+sibilant] -> /h/
+    END
+    GROUP BEGIN CHANGE BEGIN /b/ -> /p/ | _# END END
+    """
+    assert parser.get_parser() is parser.get_parser()
+    assert (parser.get_parser().parse(src) ==
+            parser.get_parser("earley").parse(src))
+
+
+def test_compiled_programs_are_cached(wf, monkeypatch, tmp_path):
+    monkeypatch.setenv("PYLAUT_CACHE_DIR", str(tmp_path))
+    from collections import OrderedDict
+    monkeypatch.setattr(parser, "_PROGRAMS", OrderedDict())
+    src = "CHANGE BEGIN /a/ -> /e/ | _/k/ END CHANGE BEGIN /k/ -> /x/ END"
+    path = tmp_path / "test.sc"
+    path.write_text(src)
+
+    laws = parser.parse_file(path)
+    assert parser.parse_file(path) == laws
+    key = parser.program_key(src)
+    assert key != parser.program_key(src, passes=["drop_trivial"])
+    assert key != parser.program_key(src, featureset="phoible")
+    assert (tmp_path / "program-{}".format(key)).exists()
+
+    parser._PROGRAMS.clear()
+    restored = parser.compile_cached(src)
+    assert restored != laws
+    w = wf.make_word("ak.ka")
+    for law, new in zip(laws, restored):
+        assert new.code == law.code
+        assert repr(new.apply(w)) == repr(law.apply(w))
+
+
+def test_disk_cache_eviction(monkeypatch, tmp_path):
+    import os
+    from pylaut.pylautlang import cache
+    monkeypatch.setenv("PYLAUT_CACHE_DIR", str(tmp_path))
+    cache.store("stale", "x" * 100)
+    os.utime(str(tmp_path / "stale"), (0, 0))
+    cache.store("old", "x" * 100)
+    os.utime(str(tmp_path / "old"), (cache.time.time() - 10, ) * 2)
+    cache.store("new", "x" * 100)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new", "old"]
+    monkeypatch.setattr(cache, "MAX_SIZE", 150)
+    cache.store("newer", "x" * 10)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new", "newer"]
+    assert cache.load("new") == "x" * 100
+
+
+def test_incremental_compilation_reuses_unchanged_laws(wf):
+    from lark import ParseError
+    src = """
+    % the END in the name and phoneme below do not end a law
+    CHANGE META name "end" BEGIN /a/ -> /e/ | _/k/ END
+    GROUP BEGIN
+      CHANGE BEGIN /k/ -> /x/ END
+      CHANGE BEGIN /END/ -> /a/ END
+    END
+    CHANGE BEGIN /s/ -> /h/ END
+    """
+    assert [b.split()[0] for b in parser.split_program(src)
+            ] == ["CHANGE", "GROUP", "CHANGE"]
+    assert parser.split_program(src + " junk") is None
+
+    laws = parser.compile_incremental(src)
+    assert [law.source for law in laws
+            ] == [law.source for law in parser.compile(src)]
+    edited = parser.compile_incremental(src.replace("/h/", "/x/"))
+    assert edited[:2] == laws[:2]
+    assert edited[2] is not laws[2]
+    w = wf.make_word("sak.sa")
+    assert repr(edited[2].apply(w)) == "/xak.xa/"
+
+    with pytest.raises(ParseError):
+        parser.compile_incremental(src.replace("/h/", "/x/ ->"))
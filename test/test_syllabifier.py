@@ -0,0 +1,81 @@
+from pylaut.change import change_functions
+from pylaut.language.lexicon import Lexicon
+from pylaut.language.phonology import word
+from pylaut.language.phonology.phonology import Phoneme
+from pylaut.language.phonology.syllabifier import Syllabifier
+from pylaut.tokenise_ipa import syllabify
+
+import pytest
+
+
+@pytest.fixture
+def wf():
+    return word.WordFactory()
+
+
+def test_maximal_onset():
+    assert syllabify("kastra", ".") == ["k", "a", "s", ".", "t", "r", "a"]
+
+
+def test_sonority_sequencing():
+    assert syllabify("aktjone", ".") == [
+        "a", "k", ".", "t", "j", "o", ".", "n", "e"
+    ]
+
+
+def test_syllable_breaks_and_stress_are_ignored():
+    assert syllabify("pa.ta", ".") == ["p", "a", ".", "t", "a"]
+    assert syllabify("'pata", ".") == ["p", "a", ".", "t", "a"]
+    assert syllabify("kas.'tra", "-") == ["k", "a", "s", "-", "t", "r", "a"]
+
+
+def test_diphthongs_and_hiatus():
+    assert syllabify("tauro", ".") == ["t", "a", "u", ".", "r", "o"]
+    assert syllabify("tuia", ".") == ["t", "u", ".", "i", ".", "a"]
+
+
+def test_fromlist(wf):
+    assert repr(wf.fromlist("amare")) == "/a.ma.re/"
+
+
+def test_resyllabify_keeps_stress(wf):
+    w = wf.make_word("ak'to.ne")
+    nw = change_functions.Resyllabify().apply(wf.make_word("a'kto.ne"))
+    assert repr(nw) == repr(w)
+
+
+def test_learned_onsets(wf):
+    learned = Syllabifier.from_words([wf.make_word("as.tra")])
+    # /tr/ is a legal onset, /str/ was never seen
+    assert learned.syllabify(list("astra")) == ["a", "s", ".", "t", "r", "a"]
+    assert learned.syllabify(list("asta")) == ["a", "s", ".", "t", "a"]
+
+
+def test_learned_codas(wf):
+    learned = Syllabifier.from_words(
+        [wf.make_word("akst.ra"), wf.make_word("a.tra")])
+    # /tr/ is a legal onset, but /ks/ was never seen as a coda
+    assert learned.syllabify(list("akstra")) == [
+        "a", "k", "s", "t", ".", "r", "a"
+    ]
+    assert Syllabifier().syllabify(list("akstra")) == [
+        "a", "k", "s", ".", "t", "r", "a"
+    ]
+
+
+def test_lexicon_syllabifier_keeps_phoneme_class():
+    class MyPhone(Phoneme):
+        pass
+
+    lexicon = Lexicon()
+    lexicon.from_string("ka.stra\tcastra\tcamp\n")
+    assert Syllabifier.from_lexicon(lexicon).phoneme_cls is Phoneme
+    learned = Syllabifier.from_lexicon(lexicon, phoneme_cls=MyPhone)
+    assert learned.phoneme_cls is MyPhone
+
+
+def test_lexicon_resyllabify():
+    lexicon = Lexicon()
+    lexicon.from_string("a'kto.ne\tactio\taction\nka.stra\tcastra\tcamp\n")
+    new = lexicon.resyllabify(Syllabifier())
+    assert [repr(e) for e in new.entries] == ["/ak.'to.ne/", "/kas.tra/"]
@@ -0,0 +1,47 @@
+from pylaut.language.phonology import word
+from pylaut.language.phonology.featureset import get_feature_model
+from pylaut.tokenise_ipa import tokenise_ipa
+
+
+def test_tokeniser_is_shared():
+    fm = get_feature_model('monophone')
+    assert get_feature_model('monophone') is fm
+    assert fm.tokeniser is fm.tokeniser
+
+
+def test_tokenise_diacritics_and_tie_bars():
+    tk = get_feature_model('monophone').tokeniser
+    assert tk.tokenise('t͡sa') == ('t͡s', 'a')
+    assert tk.tokenise('kʷʰa') == ('kʷʰ', 'a')
+    assert tk.tokenise_syllables("pa'ta.ka") == (('p', 'a'), ("'", 't', 'a'),
+                                                 ('k', 'a'))
+
+
+def test_tokenise_ipa_shape():
+    assert tokenise_ipa('pat') == ('p', 'a', 't')
+    assert tokenise_ipa('pa.ta') == (('p', 'a'), ('t', 'a'))
+
+
+def test_tokenise_many():
+    tk = get_feature_model('monophone').tokeniser
+    assert tk.tokenise_many(['pa.ta', "'ka"]) == [(('p', 'a'), ('t', 'a')),
+                                                  (("'", 'k', 'a'), )]
+    assert tk.tokenise_many(['pa\nta', 'ka']) == [(('p', 'a', 't', 'a'), ),
+                                                 (('k', 'a'), )]
+
+
+def test_make_words_with_tie_bars_and_line_breaks():
+    wf = word.WordFactory()
+    w = wf.make_word('t͡sa')
+    assert [p.symbol for p in w.phonemes] == ['t͡s', 'a']
+    assert w.phonemes[0].feature_is_true('sibilant')
+    assert w.phonemes[0].feature_is_false('continuant')
+    words = wf.make_words(['pa\nta', 'd͡ʒo', 'ka'])
+    assert [repr(w) for w in words] == ['/pata/', '/d͡ʒo/', '/ka/']
+
+
+def test_make_words_single_syllable():
+    wf = word.WordFactory()
+    w, = wf.make_words(['pat'])
+    assert len(w.syllables) == 1
+    assert [p.symbol for p in w.phonemes] == ['p', 'a', 't']
@@ -2,7 +2,6 @@ from pylaut.language import phonology
 import pytest
 
 
-@pytest.mark.xfail
 def test_syllable_nuclei():
     wf = phonology.word.WordFactory()
     w = wf.make_word('pæev')
@@ -11,8 +10,142 @@ def test_syllable_nuclei():
     assert n_nuclei == 1
 
 
-@pytest.mark.xfail
+@pytest.mark.xfail(reason="/æe/ is not a legal diphthong by sonority, so "
+                   "pæevaks is split into three syllables")
 def test_syllabification():
     wf = phonology.word.WordFactory()
     w = wf.fromlist('pæevaks')
     assert len(w.syllables) == 2
+
+
+def test_syllable_structure_cache_invalidated_in_place():
+    wf = phonology.word.WordFactory()
+    s = wf.make_word('pat.ka').thaw().syllables[0]
+    assert [p.symbol for p in s.get_coda()] == ['t']
+    version = s.version
+    s.phonemes.append(phonology.phonology.Phoneme('s'))
+    assert s.version > version
+    assert [p.symbol for p in s.get_coda()] == ['t', 's']
+    assert s.get_pattern() == 'CVCC'
+    s.phonemes.insert(0, phonology.phonology.Phoneme('s'))
+    assert [p.symbol for p in s.get_onset()] == ['s', 'p']
+
+
+def test_syllable_structure_cache_invalidated_on_assignment():
+    wf = phonology.word.WordFactory()
+    s = wf.make_word('pat.ka').thaw().syllables[0]
+    assert s.get_pattern() == 'CVC'
+    s.phonemes = s.phonemes[1:]
+    assert s.get_pattern() == 'VC'
+    assert s.structure is not None
+
+
+def test_syllable_copy_keeps_tracking_changes():
+    wf = phonology.word.WordFactory()
+    s = wf.make_word('pat.ka').syllables[0]
+    s.get_structure()
+    c = s.copy()
+    del c.phonemes[-1]
+    assert c.get_pattern() == 'CV'
+    assert s.get_pattern() == 'CVC'
+
+
+def test_word_factory_cache():
+    wf = phonology.word.WordFactory(cache_size=2)
+    w = wf.make_word("'pa.ta")
+    assert wf.make_word("'pa.ta") is w
+    wf.make_words(["ka", "ta", "ka"])
+    info = wf.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 3, 2)
+    # evicted as least recently used, but still the same interned word
+    assert wf.make_word("'pa.ta") is w
+    assert wf.cache_info().misses == 4
+
+
+def test_made_words_are_frozen():
+    wf = phonology.word.WordFactory()
+    w = wf.make_word("pat.ka")
+    with pytest.raises(TypeError):
+        w.syllables[0].phonemes.append(w.phonemes[0])
+    with pytest.raises(TypeError):
+        w.syllables[0].set_stressed()
+    t = w.thaw()
+    t.syllables[0].set_stressed()
+    assert repr(t) == "/'pat.ka/"
+    assert repr(w) == "/pat.ka/"
+
+
+def test_word_interning():
+    wf = phonology.word.WordFactory(cache_size=0)
+    w1 = wf.make_word("pa.ta")
+    w2 = wf.make_word("pa.ta")
+    assert w1 is w2
+    assert w1.uid is not None
+    assert wf.make_word("'pa.ta").uid != w1.uid
+    t = w1.thaw()
+    assert t.key() == w1.key()
+    assert phonology.word.intern_word(t) is w1
+
+
+def test_words_of_other_phone_classes_are_not_shared():
+    from pylaut.change.memo import ApplicationMemo
+
+    class MyPhone(phonology.phonology.Phoneme):
+        pass
+
+    w = phonology.word.WordFactory().make_word("ta")
+    mine = phonology.word.WordFactory(phoneme_cls=MyPhone).make_word("ta")
+    assert mine is not w
+    assert mine.key() != w.key()
+    assert all(isinstance(p, MyPhone) for p in mine.phonemes)
+
+    class Identity(object):
+        def apply(self, word):
+            return word
+
+    memo = ApplicationMemo()
+    assert memo.apply(0, Identity(), w) is w
+    assert memo.apply(0, Identity(), mine) is mine
+    assert memo.misses == 2
+
+
+def test_changes_keep_properties_of_untouched_syllables():
+    from pylaut.pylautlang import parser
+    wf = phonology.word.WordFactory()
+    w = wf.make_word("'pa.tak")
+    for syl in w.syllables:
+        syl.get_structure()
+    sc = parser.compile("CHANGE BEGIN /p/ -> /b/ END")[0]
+    nw = sc.apply(w)
+    assert repr(nw) == "/'ba.tak/"
+    assert nw.syllables[0].structure is None
+    assert nw.syllables[0].is_stressed()
+    assert nw.syllables[1].structure is not None
+    assert nw.syllables[1].get_weight() == 2
+    assert not nw.syllables[0].is_heavy()
+
+    final = parser.compile("CHANGE BEGIN /k/ -> /g/ | _/a/ END")[0]
+    assert final.apply(w) is w
+
+
+def test_tones_are_kept_on_their_own_tier(tones):
+    from pylaut.change.change_functions import replace_phonemes
+    from pylaut.language.phonology.syllabifier import Syllabifier
+    Phoneme = phonology.phonology.Phoneme
+    high, low = tones
+    w = phonology.word.Word([
+        phonology.word.Syllable([Phoneme("m"), Phoneme("a"), high]),
+        phonology.word.Syllable([Phoneme("t"), Phoneme("a"), low]),
+    ])
+    assert [p.symbol for p in w.phonemes] == ["m", "a", "t", "a"]
+    assert [(i, t.symbol) for i, t in w.tones] == [(0, "˥"), (1, "˩")]
+    assert w.syllables[0].get_pattern() == "CV"
+    assert repr(w) == "/ma˥.ta˩/"
+
+    lowering = replace_phonemes([high], [low])
+    assert repr(lowering.apply(w)) == "/ma˩.ta˩/"
+    voicing = replace_phonemes([Phoneme("t")], [Phoneme("d")])
+    assert repr(voicing.apply(w)) == "/ma˥.da˩/"
+    plain = phonology.word.WordFactory().make_word("ma.ta")
+    assert lowering.apply(plain) is plain
+    assert repr(Syllabifier().resyllabify(w)) == "/ma˥.ta˩/"